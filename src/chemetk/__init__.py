@@ -1,12 +1,36 @@
 # chemetk/__init__.py
-from .thermo.vle import VLE
-from .unit_ops.distillation import McCabeThiele
-from .visualization.plotting import plot_mccabe_thiele
-from .io.vle_datamanager import VLEManager
+import importlib
+from typing import TYPE_CHECKING
+
+# 顶层名称按需导入 (PEP 562)：import chemetk 或其子包 (如 chemetk.io) 时
+# 不会连带加载 numpy / scipy / pandas / matplotlib 等重量级依赖。
+_LAZY_ATTRS = {
+    'VLE': '.thermo.vle',
+    'McCabeThiele': '.unit_ops.distillation',
+    'plot_mccabe_thiele': '.visualization.plotting',
+    'VLEManager': '.io.vle_datamanager',
+}
+
+if TYPE_CHECKING:
+    from .thermo.vle import VLE
+    from .unit_ops.distillation import McCabeThiele
+    from .visualization.plotting import plot_mccabe_thiele
+    from .io.vle_datamanager import VLEManager
 
 __all__ = [
     'VLE',
     'McCabeThiele',
     'plot_mccabe_thiele',
     'VLEManager',
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,20 @@
+# chemetk/_numba_compat.py
+"""
+numba 是可选依赖：安装后计算核心会被 JIT 编译为机器码，
+未安装时 njit 退化为原样返回函数的装饰器，prange 退化为 range。
+"""
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba.njit 的占位实现，支持 @njit 与 @njit(...) 两种写法"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
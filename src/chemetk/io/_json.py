@@ -0,0 +1,41 @@
+# chemetk/io/_json.py
+"""
+JSON 编解码的统一入口。
+
+优先使用 orjson (C/Rust 实现，解码速度为标准库的数倍)，未安装时回退到标准库 json。
+两者都直接处理 bytes，调用方应配合 Path.read_bytes() / 二进制写入使用，省去文本模式的解码与换行转换。
+orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，原有的异常处理无需修改。
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+def _default(obj):
+    """序列化 numpy 标量等内置类型以外的数值：有 tolist() 的对象转换为 Python 内置类型"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if orjson is not None:
+    def loads(data):
+        """将 bytes/str 解析为 Python 对象"""
+        return orjson.loads(data)
+
+    def dumps(obj):
+        """将 Python 对象序列化为 UTF-8 编码的 bytes"""
+        # orjson 默认不接受 numpy 标量和数组 (标准库 json 可以处理 np.float64)，需显式开启
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+else:
+    def loads(data):
+        """将 bytes/str 解析为 Python 对象"""
+        return json.loads(data)
+
+    def dumps(obj):
+        """将 Python 对象序列化为 UTF-8 编码的 bytes"""
+        return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(',', ':'),
+                          default=_default).encode('utf-8')
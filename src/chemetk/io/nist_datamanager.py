@@ -1,10 +1,23 @@
-import json
+import os
 import hashlib
+from io import BytesIO
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import requests
-from io import StringIO
+from requests.adapters import HTTPAdapter
 
 from . import paths  # 导入统一的路径管理器
+from . import _json
+
+# Parquet (pyarrow) 是首选的缓存格式：列式、保留 dtype、读取远快于 JSON。
+# 未安装 pyarrow 时回退到 gzip 压缩的 JSON 格式。
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
 
 # 【修改】使用统一的 paths 模块获取可写目录
 # 在用户数据目录下创建一个 'nist' 子目录来存放NIST缓存
@@ -14,89 +27,162 @@ INDEX_FILE = CACHE_DIR / 'nist_data_index.json'
 # 确保缓存目录在模块加载时就存在
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# 模块级共享会话：复用 TCP/TLS 连接，避免每次请求都重新握手
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_SESSION.headers['User-Agent'] = 'cheme-toolkit (https://github.com/Grtresy/chemetk)'
+
+def _plain(value):
+    """将 numpy 标量转换为对应的 Python 内置类型 (如 np.float64(300.0) -> 300.0)，其余值原样返回"""
+    return value.item() if isinstance(value, np.generic) else value
+
 def _get_request_hash(params):
-    """根据请求参数生成唯一的哈希值"""
-    params_str = json.dumps(params, sort_keys=True)
-    return hashlib.sha256(params_str.encode('utf-8')).hexdigest()
+    """
+    根据请求参数生成唯一的哈希值。
+    参数字典先规范化为按键排序的元组再取 repr，比 json.dumps(sort_keys=True) 快得多。
+    numpy 标量先转换为 Python 内置类型：numpy 2 中 repr(np.float64(300.0)) 为 'np.float64(300.0)'，
+    否则同一请求会得到不同的哈希而无法命中缓存。
+    """
+    canonical = tuple(sorted((key, _plain(value)) for key, value in params.items()))
+    return hashlib.blake2b(repr(canonical).encode('utf-8'), digest_size=16).hexdigest()
+
+# 索引文件的内存缓存：mtime 未变化时直接返回上次解析的结果
+_INDEX_CACHE = {'mtime_ns': None, 'data': {}}
 
 def _load_index():
-    """加载缓存索引文件"""
-    if not INDEX_FILE.exists():
+    """加载缓存索引文件 (返回的字典为只读共享对象，修改前请先复制)"""
+    try:
+        mtime_ns = INDEX_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
-    with open(INDEX_FILE, 'r') as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
+    if mtime_ns == _INDEX_CACHE['mtime_ns']:
+        return _INDEX_CACHE['data']
+    try:
+        index = _json.loads(INDEX_FILE.read_bytes())
+    except _json.JSONDecodeError:
+        index = {}
+    _INDEX_CACHE.update(mtime_ns=mtime_ns, data=index)
+    return index
 
 def _save_index(index):
-    """保存缓存索引文件"""
-    with open(INDEX_FILE, 'w') as f:
-        json.dump(index, f, indent=4)
+    """
+    保存缓存索引文件。
+    先写入临时文件再用 os.replace 原子替换，避免写入中途崩溃导致索引损坏、所有缓存失效。
+    """
+    tmp_file = INDEX_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(_json.dumps(index))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, INDEX_FILE)
+    # 刚写入的内容即为最新索引，直接更新内存缓存，下次读取无需重新解析
+    _INDEX_CACHE.update(mtime_ns=INDEX_FILE.stat().st_mtime_ns, data=index)
+
+def _read_cache_file(filepath, dtypes=None):
+    """
+    根据文件后缀读取缓存的数据文件。
+    dtypes 为写入时记录的 {列名: dtype 字符串}；JSON 缓存据此直接构造各列，跳过 pandas 的类型推断。
+    """
+    if filepath.suffix == '.parquet':
+        return pd.read_parquet(filepath, engine='pyarrow')
+    # '.json.gz' 为 gzip 压缩的 JSON，旧版本写入的 '.json' 为未压缩
+    compression = 'gzip' if filepath.suffix == '.gz' else None
+    if dtypes:
+        return pd.read_json(filepath, orient='split', compression=compression,
+                            dtype=dict(dtypes), convert_dates=False)
+    return pd.read_json(filepath, orient='split', compression=compression)
+
+def _write_cache_file(df, filepath):
+    """根据文件后缀写入缓存的数据文件"""
+    if filepath.suffix == '.parquet':
+        df.to_parquet(filepath, engine='pyarrow', compression='zstd')
+    elif filepath.suffix == '.gz':
+        # NIST 数据表压缩率很高；compresslevel=3 在压缩率和 CPU 开销之间取得较好平衡
+        df.to_json(filepath, orient='split', compression={'method': 'gzip', 'compresslevel': 3})
+    else:
+        # 使用 'split' 格式，它比 'records' 更高效，且与 _read_cache_file 匹配
+        df.to_json(filepath, orient='split', indent=4)
+
+@lru_cache(maxsize=64)
+def _load_df(filepath, mtime_ns, dtypes=None):
+    """
+    读取缓存数据文件；以 (路径, mtime) 为键缓存解析后的 DataFrame。
+    dtypes 为 ((列名, dtype 字符串), ...) 元组，以便作为缓存键。
+    """
+    return _read_cache_file(filepath, dtypes)
 
-def get_cached_data(request_params):
+def get_cached_data(request_params, request_hash=None):
     """
     尝试从缓存中获取数据。
+    request_hash 为已计算好的请求哈希，未提供时根据 request_params 计算。
     """
     index = _load_index()
-    request_hash = _get_request_hash(request_params)
+    if request_hash is None:
+        request_hash = _get_request_hash(request_params)
     
     if request_hash in index:
         file_info = index[request_hash]
         filepath = CACHE_DIR / file_info['filename']
-        if filepath.exists():
+        # 旧版本写入的 .json 缓存仍按后缀正常读取；没有 pyarrow 时无法读取 .parquet
+        readable = filepath.suffix != '.parquet' or _HAS_PYARROW
+        try:
+            mtime_ns = filepath.stat().st_mtime_ns
+        except FileNotFoundError:
+            readable = False
+        if readable:
             print(f"从缓存加载数据: {filepath}")
-            # 【修复】原始代码中保存和读取的 orient 不一致
-            # 保存时用 'split'，读取时也用 'split'
-            return pd.read_json(filepath, orient='split')
+            # 旧版本写入的索引项没有 dtypes 字段，此时回退到类型推断
+            dtypes = tuple(file_info.get('dtypes', {}).items()) or None
+            # 返回副本，避免调用方的修改污染内存缓存
+            return _load_df(filepath, mtime_ns, dtypes).copy()
             
     return None
 
-def cache_data(df, request_params):
+def cache_data(df, request_params, request_hash=None):
     """
     将从NIST获取的数据缓存到本地。
+    request_hash 为已计算好的请求哈希，未提供时根据 request_params 计算。
     """
-    index = _load_index()
-    request_hash = _get_request_hash(request_params)
+    index = dict(_load_index())
+    if request_hash is None:
+        request_hash = _get_request_hash(request_params)
     
-    filename = f"{request_hash}.json"
+    filename = f"{request_hash}.parquet" if _HAS_PYARROW else f"{request_hash}.json.gz"
     filepath = CACHE_DIR / filename
     
     # 保存数据文件
-    # 【修复】使用 'split' 格式，它比 'records' 更高效，且与 get_cached_data 匹配
-    df.to_json(filepath, orient='split', indent=4)
+    _write_cache_file(df, filepath)
     
     # 更新并保存索引文件
     index[request_hash] = {
         'params': request_params,
-        'filename': filename
+        'filename': filename,
+        # 记录各列 dtype，读取 JSON 缓存时无需重新推断类型
+        'dtypes': df.dtypes.astype(str).to_dict()
     }
     _save_index(index)
     print(f"数据已缓存至: {filepath}")
 
-def fetch_isotherm_data(fluid_id, temp, p_low, p_high, p_inc=0.1, t_unit='K', p_unit='MPa'):
+def _make_request_params(fluid_id, temp, p_low, p_high, p_inc, t_unit, p_unit):
     """
-    从 NIST Webbook 获取指定流体的等温线物性数据。
-    如果本地存在缓存，则从缓存加载数据。
-    
-    ... (Args 和 Returns 不变) ...
+    构造用于缓存索引的请求参数字典。
+    numpy 标量 (如遍历 np.linspace 得到的温度) 转换为 Python 内置类型，保证哈希一致且可写入 JSON 索引。
     """
-    request_params = {
-        'fluid_id': fluid_id,
-        'temp': temp,
-        'p_low': p_low,
-        'p_high': p_high,
-        'p_inc': p_inc,
+    return {
+        'fluid_id': _plain(fluid_id),
+        'temp': _plain(temp),
+        'p_low': _plain(p_low),
+        'p_high': _plain(p_high),
+        'p_inc': _plain(p_inc),
         't_unit': t_unit,
         'p_unit': p_unit,
     }
 
-    # 检查缓存 (现在会调用 chemetk/io/cache.py 中的函数)
-    cached_df = get_cached_data(request_params)
-    if cached_df is not None:
-        return cached_df
-
-    print("本地未找到缓存，正在从NIST请求数据...")
+def _request_isotherm(fluid_id, temp, p_low, p_high, p_inc, t_unit, p_unit):
+    """
+    向 NIST Webbook 请求一条等温线并解析为 DataFrame (不读写缓存)。
+    请求失败或没有数据时返回 None。
+    """
     url = "https://webbook.nist.gov/cgi/fluid.cgi"
     params = {
         'Action': 'Data', 
@@ -119,25 +205,96 @@ def fetch_isotherm_data(fluid_id, temp, p_low, p_high, p_inc=0.1, t_unit='K', p_
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            lines = response.text.strip().split('\n')
-            data_lines = [line for line in lines if not line.strip().startswith('#')]
-            if not data_lines:
-                print("警告: 未从NIST获取到有效数据行。")
+        with _SESSION.get(url, params=params, timeout=10) as response:
+            if response.status_code != 200:
+                print(f"从NIST请求数据失败，状态码: {response.status_code}")
                 return None
-            
-            data_io = StringIO('\n'.join(data_lines))
-            df = pd.read_csv(data_io, sep='\t')
 
-            # 缓存数据
-            cache_data(df, request_params)
-            
-            return df
-        else:
-            print(f"从NIST请求数据失败，状态码: {response.status_code}")
+            # 只去掉以 '#' 开头的注释行 (与原实现相同)，字段中的 '#' 保持原样；
+            # read_csv 的 comment='#' 会从行内任意 '#' 处截断，因此不使用。
+            # 在字节层面过滤并交给 C 解析器直接完成 UTF-8 解码，不经过 response.text
+            data = b'\n'.join(line for line in response.content.splitlines()
+                               if not line.lstrip().startswith(b'#'))
+            try:
+                df = pd.read_csv(BytesIO(data), sep='\t', engine='c', encoding='utf-8')
+            except pd.errors.EmptyDataError:
+                df = None
+
+        if df is None or df.empty:
+            print("警告: 未从NIST获取到有效数据行。")
             return None
+
+        return df
     except requests.exceptions.RequestException as e:
         print(f"网络请求失败: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def fetch_isotherm_data(fluid_id, temp, p_low, p_high, p_inc=0.1, t_unit='K', p_unit='MPa'):
+    """
+    从 NIST Webbook 获取指定流体的等温线物性数据。
+    如果本地存在缓存，则从缓存加载数据。
+    
+    ... (Args 和 Returns 不变) ...
+    """
+    request_params = _make_request_params(fluid_id, temp, p_low, p_high, p_inc, t_unit, p_unit)
+    # 每个请求只计算一次哈希，查缓存和写缓存共用
+    request_hash = _get_request_hash(request_params)
+
+    # 检查缓存 (现在会调用 chemetk/io/cache.py 中的函数)
+    cached_df = get_cached_data(request_params, request_hash)
+    if cached_df is not None:
+        return cached_df
+
+    print("本地未找到缓存，正在从NIST请求数据...")
+    df = _request_isotherm(fluid_id, temp, p_low, p_high, p_inc, t_unit, p_unit)
+    if df is not None:
+        # 缓存数据
+        cache_data(df, request_params, request_hash)
+    return df
+
+def fetch_isotherm_data_batch(fluid_id, temps, p_low, p_high, p_inc=0.1, t_unit='K', p_unit='MPa',
+                              max_workers=8):
+    """
+    获取同一流体在多个温度下的等温线物性数据。
+    先逐个检查本地缓存，未命中的温度通过线程池共享同一个会话并行请求 NIST。
+
+    Args:
+        fluid_id (str): NIST 流体 ID.
+        temps (Iterable[float]): 温度列表.
+        p_low (float): 压力下限.
+        p_high (float): 压力上限.
+        p_inc (float): 压力步长 (默认: 0.1).
+        t_unit (str): 温度单位 (默认: 'K').
+        p_unit (str): 压力单位 (默认: 'MPa').
+        max_workers (int): 并行请求的最大线程数 (默认: 8).
+
+    Returns:
+        dict: {温度: DataFrame}，获取失败的温度对应 None。
+    """
+    temps = list(temps)
+    results = {}
+    misses = []
+    for temp in temps:
+        request_params = _make_request_params(fluid_id, temp, p_low, p_high, p_inc, t_unit, p_unit)
+        request_hash = _get_request_hash(request_params)
+        cached_df = get_cached_data(request_params, request_hash)
+        if cached_df is not None:
+            results[temp] = cached_df
+        else:
+            misses.append((temp, request_params, request_hash))
+
+    if misses:
+        print(f"本地未找到 {len(misses)} 个温度的缓存，正在并行从NIST请求数据...")
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(misses))) as executor:
+            dfs = list(executor.map(
+                lambda temp: _request_isotherm(fluid_id, temp, p_low, p_high, p_inc, t_unit, p_unit),
+                [temp for temp, _, _ in misses]
+            ))
+
+        # 缓存索引的读写在主线程中串行完成，避免并发写入索引文件
+        for (temp, request_params, request_hash), df in zip(misses, dfs):
+            if df is not None:
+                cache_data(df, request_params, request_hash)
+            results[temp] = df
+
+    return {temp: results[temp] for temp in temps}
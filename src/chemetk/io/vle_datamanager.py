@@ -1,9 +1,45 @@
 import os
-import json
-import glob
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from pathlib import Path
 from . import paths  # 导入统一的路径管理器
+from . import _json
+
+def _scan_data_points(data_points: List[Dict]) -> Dict:
+    """
+    单次遍历数据点，统计相对挥发度点数以及温度、组成范围。
+    """
+    alpha_points = 0
+    min_t = max_t = None
+    min_x = max_x = None
+    for p in data_points:
+        if p.get("alpha") is not None:
+            alpha_points += 1
+        if "temp" in p:
+            t = p["temp"]
+            if min_t is None:
+                min_t = max_t = t
+            elif t < min_t:
+                min_t = t
+            elif t > max_t:
+                max_t = t
+        if "x" in p:
+            x = p["x"]
+            if min_x is None:
+                min_x = max_x = x
+            elif x < min_x:
+                min_x = x
+            elif x > max_x:
+                max_x = x
+
+    return {
+        "data_points": len(data_points),
+        "has_alpha_data": alpha_points >= 2,
+        "alpha_data_points": alpha_points,
+        "temperature_range": (min_t, max_t),
+        "composition_range": (min_x, max_x),
+    }
 
 class VLEManager:
     """
@@ -33,38 +69,83 @@ class VLEManager:
             print(f"用户VLE数据目录不存在，已自动创建：{self.user_vle_dir}")
             
         self._data_files = {}
+        # 查找索引: 体系名称 -> 键名，组分集合 -> 键名列表
+        self._name_index = {}
+        self._component_index = defaultdict(list)
+        # 已解析文件的缓存: {绝对路径: file_info}，file_info 中记录解析时的 mtime_ns
+        self._parsed_files = {}
         self._load_data_files()
     
+    def _parse_file(self, json_file: str, filename: str, mtime_ns: int) -> Dict:
+        """
+        辅助函数：解析单个 .json 文件，返回其 file_info。
+
+        :param json_file: 文件的绝对路径
+        :param filename: 文件名 (含 .json 扩展名)
+        :param mtime_ns: 文件的修改时间
+        """
+        with open(json_file, 'rb') as f:
+            data = _json.loads(f.read())
+        
+        name = data.get("name", filename[:-5])
+        
+        file_info = {
+            "name": name,
+            "path": json_file,
+            "filename": filename,
+            "components": data.get("components", ["Component_A", "Component_B"]),
+            "mtime_ns": mtime_ns
+        }
+        # 加载时即完成统计，get_system_info_by_filename 无需再次读取文件
+        file_info.update(_scan_data_points(data.get("data", [])))
+        self._parsed_files[file_info["path"]] = file_info
+        return file_info
+
     def _load_files_from_path(self, data_path: Path):
         """
-        辅助函数：从指定路径加载所有 .json 文件到 self._data_files
+        辅助函数：从指定路径加载所有 .json 文件到 self._data_files。
+        修改时间未变化的文件直接复用上次的解析结果。
         """
-        json_pattern = str(data_path / "*.json")
-        json_files = glob.glob(json_pattern)
+        # os.scandir 直接返回目录项信息，避免 glob 的模式匹配和额外的 stat 调用；
+        # 目录先转为绝对路径，entry.path 即为绝对路径，无需逐个文件调用 os.path.*
+        with os.scandir(os.path.abspath(data_path)) as it:
+            json_files = sorted(
+                (entry.path, entry.name, entry.stat().st_mtime_ns) for entry in it
+                if entry.name.endswith('.json') and entry.is_file()
+            )
         
-        for json_file in json_files:
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                name = data.get("name", os.path.splitext(os.path.basename(json_file))[0])
-                
-                file_info = {
-                    "name": name,
-                    "path": os.path.abspath(json_file),
-                    "filename": os.path.basename(json_file),
-                    "components": data.get("components", ["Component_A", "Component_B"])
-                }
-                
-                # 使用文件名（不含扩展名）作为键
-                key = os.path.splitext(os.path.basename(json_file))[0]
-                
-                # 如果键已存在，此操作会覆盖它（实现用户文件优先）
-                self._data_files[key] = file_info
-                
-            except (json.JSONDecodeError, KeyError, IOError) as e:
-                print(f"警告: 无法加载文件 {json_file}: {e}")
+        # 需要(重新)解析的文件交给线程池并行读取，重叠磁盘 I/O
+        stale = [
+            (json_file, filename, mtime_ns) for json_file, filename, mtime_ns in json_files
+            if self._parsed_files.get(json_file, {}).get("mtime_ns") != mtime_ns
+        ]
+        if len(stale) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(stale))) as executor:
+                parsed = list(executor.map(lambda args: self._try_parse_file(*args), stale))
+        else:
+            parsed = [self._try_parse_file(*args) for args in stale]
+        errors = {args[0]: result for args, result in zip(stale, parsed) if isinstance(result, Exception)}
+        
+        # 合并结果在当前线程中按文件名顺序串行完成
+        for json_file, filename, mtime_ns in json_files:
+            if json_file in errors:
+                print(f"警告: 无法加载文件 {json_file}: {errors[json_file]}")
                 continue
+            
+            # 使用文件名（不含扩展名）作为键
+            key = filename[:-5]
+            
+            # 如果键已存在，此操作会覆盖它（实现用户文件优先）
+            self._data_files[key] = self._parsed_files[json_file]
+
+    def _try_parse_file(self, json_file: str, filename: str, mtime_ns: int):
+        """
+        辅助函数：在线程池中解析单个文件，出错时返回异常对象而不是抛出。
+        """
+        try:
+            return self._parse_file(json_file, filename, mtime_ns)
+        except (_json.JSONDecodeError, KeyError, IOError, TypeError) as e:
+            return e
 
     def _load_data_files(self):
         """
@@ -74,6 +155,8 @@ class VLEManager:
         1.  先加载包内数据。
         2.  再加载用户数据 (同名文件将覆盖包内数据)。
         """
+        self._data_files = {}
+
         print(f"正在从包内目录加载VLE数据: {self.builtin_data_dir}")
         self._load_files_from_path(self.builtin_data_dir)
         
@@ -83,6 +166,23 @@ class VLEManager:
         if not self._data_files:
             print(f"警告: 在 {self.builtin_data_dir} 和 {self.user_vle_dir} 中均未找到 VLE .json 文件。")
 
+        self._build_indexes()
+
+    def _build_indexes(self):
+        """
+        根据 self._data_files 重建按体系名称和组分查找的索引，使查询为 O(1)。
+        """
+        self._name_index = {info["name"]: key for key, info in self._data_files.items()}
+        self._component_index = defaultdict(list)
+        for key, info in self._data_files.items():
+            self._component_index[frozenset(info["components"])].append(key)
+
+    def reload(self):
+        """
+        重新扫描数据目录。只有新增或修改过的文件会被重新解析。
+        """
+        self._load_data_files()
+
     # ... (get_all_files, get_file_by_name, get_file_path, ... )
     # ... (list_available_systems, get_system_info, print_available_systems)
     # 【注意】所有其他方法 (get_all_files, get_system_info 等) 保持不变。
@@ -98,6 +198,20 @@ class VLEManager:
         file_info = self._data_files.get(filename)
         return file_info["path"] if file_info else None
 
+    def get_file_by_name(self, name: str) -> Optional[Dict]:
+        """
+        根据数据文件中的体系名称 (JSON 的 "name" 字段) 查找文件信息。
+        """
+        key = self._name_index.get(name)
+        return self._data_files.get(key) if key is not None else None
+
+    def get_files_by_components(self, components: List[str]) -> List[Dict]:
+        """
+        查找包含给定组分 (与顺序无关) 的所有数据文件信息。
+        """
+        keys = self._component_index.get(frozenset(components), [])
+        return [self._data_files[key] for key in keys]
+
     def list_available_systems(self) -> List[str]:
         return list(self._data_files.keys())
 
@@ -106,35 +220,27 @@ class VLEManager:
         if not file_info:
             return None
         
+        # 文件在加载后被修改过时，重新解析以返回最新的统计信息
         try:
-            with open(file_info["path"], 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            data_points = data.get("data", [])
-            total_points = len(data_points)
-            
-            alpha_points = len([p for p in data_points if p.get("alpha") is not None])
-            has_alpha = alpha_points >= 2
-            
-            temps = [p["temp"] for p in data_points if "temp" in p]
-            temp_range = (min(temps), max(temps)) if temps else (None, None)
-            
-            x_values = [p["x"] for p in data_points if "x" in p]
-            x_range = (min(x_values), max(x_values)) if x_values else (None, None)
-            
-            return {
-                "name": data.get("name", name),
-                "components": data.get("components", ["Component_A", "Component_B"]),
-                "file_path": file_info["path"],
-                "data_points": total_points,
-                "has_alpha_data": has_alpha,
-                "alpha_data_points": alpha_points,
-                "temperature_range": temp_range,
-                "composition_range": x_range
-            }
-        except (json.JSONDecodeError, IOError, KeyError, TypeError) as e:
-            print(f"警告: 无法读取系统 {name} 的详细信息: {e}")
+            mtime_ns = os.stat(file_info["path"]).st_mtime_ns
+            if mtime_ns != file_info["mtime_ns"]:
+                file_info = self._parse_file(file_info["path"], file_info["filename"], mtime_ns)
+                self._data_files[filename] = file_info
+                self._build_indexes()
+        except (_json.JSONDecodeError, KeyError, IOError, TypeError) as e:
+            print(f"警告: 无法读取系统 {filename} 的详细信息: {e}")
             return None
+        
+        return {
+            "name": file_info["name"],
+            "components": file_info["components"],
+            "file_path": file_info["path"],
+            "data_points": file_info["data_points"],
+            "has_alpha_data": file_info["has_alpha_data"],
+            "alpha_data_points": file_info["alpha_data_points"],
+            "temperature_range": file_info["temperature_range"],
+            "composition_range": file_info["composition_range"]
+        }
 
     def print_available_systems(self):
         print("可用的VLE系统:")
@@ -146,7 +252,7 @@ class VLEManager:
             return
             
         for key in self.list_available_systems():
-            info = self.get_system_info(key)
+            info = self.get_system_info_by_filename(key)
             if info:
                 # 检查文件路径以判断来源
                 is_user_file = Path(info['file_path']).parent == self.user_vle_dir
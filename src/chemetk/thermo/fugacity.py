@@ -1,10 +1,52 @@
+import math
 import numpy as np
 from scipy import integrate
 
+from .._numba_compat import HAS_NUMBA, njit
+
 # 常数
 R = 8.314  # J/mol·K
 
-def calculate_fugacity_from_pv_data(pressures_pa, volumes_m3_per_mol, temp_k,p_ref=1e5, mu_ref=0.0):
+@njit(cache=True)
+def _fugacity_kernel(p, v, rt, p_ref, mu_ref):
+    """
+    单次循环完成被积函数、梯形积分、逸度系数、逸度和化学势的计算，不产生中间数组。
+    与 NumPy 实现一致：只在 p>0 的数据点上积分，p<=0 处 φ=1、μ=-inf。
+    """
+    n = p.shape[0]
+    fugacities = np.empty_like(p)
+    phi = np.empty_like(p)
+    mu = np.empty_like(p)
+
+    ln_phi = 0.0
+    prev_integrand = 0.0
+    prev_p = 0.0
+    started = False
+    for i in range(n):
+        p_i = p[i]
+        if p_i > 0:
+            integrand = v[i] / rt - 1.0 / p_i
+            if started:
+                ln_phi += 0.5 * (integrand + prev_integrand) * (p_i - prev_p)
+            started = True
+            prev_integrand = integrand
+            prev_p = p_i
+            phi_i = math.exp(ln_phi)
+        else:
+            phi_i = 1.0
+
+        f_i = phi_i * p_i
+        phi[i] = phi_i
+        fugacities[i] = f_i
+        if f_i > 0:
+            mu[i] = mu_ref + rt * math.log(f_i / p_ref)
+        else:
+            mu[i] = -math.inf
+
+    return fugacities, phi, mu
+
+
+def calculate_fugacity_from_pv_data(pressures_pa, volumes_m3_per_mol, temp_k,p_ref=1e5, mu_ref=0.0, dtype=None):
     """
     根据P-V-T数据计算逸度、逸度系数和化学势。
 
@@ -14,6 +56,8 @@ def calculate_fugacity_from_pv_data(pressures_pa, volumes_m3_per_mol, temp_k,p_r
         temp_k (float): 体系温度 (单位: K).
         p_ref (float): 参考压力 (默认: 1e5 Pa).
         mu_ref (float): 参考化学势 (默认: 0.0 J/mol).
+        dtype (np.dtype): 计算使用的浮点类型 (默认: 跟随输入数组；整数输入按 float64 计算)。
+            对精度要求不高的场景可传入 float32 输入以减半内存带宽。
 
     Returns:
         tuple: 包含逸度(Pa), 逸度系数(无量纲), 化学势(J/mol)的元组。
@@ -22,22 +66,32 @@ def calculate_fugacity_from_pv_data(pressures_pa, volumes_m3_per_mol, temp_k,p_r
     if len(pressures_pa) != len(volumes_m3_per_mol):
         raise ValueError("压力和体积数组的长度必须相等。")
 
+    pressures_pa = np.asarray(pressures_pa)
+    volumes_m3_per_mol = np.asarray(volumes_m3_per_mol)
+    if dtype is None:
+        dtype = np.result_type(pressures_pa.dtype, volumes_m3_per_mol.dtype, np.float32)
+    dtype = np.dtype(dtype)
+    pressures_pa = pressures_pa.astype(dtype, copy=False)
+    volumes_m3_per_mol = volumes_m3_per_mol.astype(dtype, copy=False)
+    rt = dtype.type(R * temp_k)
+
+    # 安装了 numba 时使用融合后的编译核心
+    if HAS_NUMBA:
+        return _fugacity_kernel(pressures_pa, volumes_m3_per_mol, rt, p_ref, mu_ref)
+
     # 被积函数: V/RT - 1/p
     # 注意处理 p=0 的情况，此时被积函数为0
-    integrand = np.zeros_like(pressures_pa, dtype=float)
+    # 直接在同一个数组上原地计算，避免掩码取值再回填产生的临时数组
     non_zero_p_mask = pressures_pa > 0
+    integrand = np.divide(volumes_m3_per_mol, rt)
+    integrand -= np.divide(1.0, pressures_pa, where=non_zero_p_mask, out=np.zeros_like(integrand))
+    integrand[~non_zero_p_mask] = 0.0
     
-    p_nonzero = pressures_pa[non_zero_p_mask]
-    v_nonzero = volumes_m3_per_mol[non_zero_p_mask]
-    
-    integrand[non_zero_p_mask] = v_nonzero / (R * temp_k) - 1.0 / p_nonzero
-    
-    # 梯形法数值积分计算逸度系数的对数
-    # integrate.cumtrapz 返回比输入短一个元素的数组，我们在前面补0
-    ln_phi_integrated = integrate.cumulative_trapezoid(integrand[non_zero_p_mask], p_nonzero, initial=0)
-
-    ln_phi = np.zeros_like(pressures_pa, dtype=float)
-    ln_phi[non_zero_p_mask] = ln_phi_integrated
+    # 梯形法数值积分计算逸度系数的对数 (仅在 p>0 的数据点上积分)
+    # integrate.cumulative_trapezoid 返回比输入短一个元素的数组，initial=0 在前面补0
+    ln_phi = np.zeros_like(integrand)
+    ln_phi[non_zero_p_mask] = integrate.cumulative_trapezoid(
+        integrand[non_zero_p_mask], pressures_pa[non_zero_p_mask], initial=0)
 
     # 逸度系数和逸度
     phi = np.exp(ln_phi)
@@ -47,6 +101,6 @@ def calculate_fugacity_from_pv_data(pressures_pa, volumes_m3_per_mol, temp_k,p_r
     # 避免对0取对数
     chemical_potentials_j_mol = np.full_like(fugacities_pa, -np.inf)
     valid_f_mask = fugacities_pa > 0
-    chemical_potentials_j_mol[valid_f_mask] = mu_ref + R * temp_k * np.log(fugacities_pa[valid_f_mask] / p_ref)
+    chemical_potentials_j_mol[valid_f_mask] = mu_ref + rt * np.log(fugacities_pa[valid_f_mask] / p_ref)
     
     return fugacities_pa, phi, chemical_potentials_j_mol
\ No newline at end of file
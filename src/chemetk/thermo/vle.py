@@ -1,7 +1,172 @@
 # chemetk/thermo/vle.py
-import json
+import sys
+from bisect import bisect_right
+from functools import cached_property
+
 import numpy as np
-from scipy.interpolate import interp1d
+from scipy.interpolate import CubicSpline, PchipInterpolator, PPoly
+
+from .._numba_compat import HAS_NUMBA, njit
+from ..io import _json
+
+def _cubic_splines(a, *bs):
+    """
+    以 a 为自变量，对每个 b 构造分段三次插值函数，超出数据范围时返回 NaN。
+    二元体系的 y-x、T-x、T-y 等曲线是单调的：b 随 a 严格单调时使用保单调的 PCHIP，
+    不会在端点附近振荡产生 y>1 或温度回弯，且构造只需局部差分、无需求解三对角方程组；
+    否则 (如相对挥发度) 使用 not-a-knot 三次样条 (与 interp1d(kind='cubic') 相同)。
+    两者都以 PPoly 系数形式保存。插值要求自变量严格递增，因此先按 a 排序，
+    同一自变量上的多个插值函数只排序一次。
+    """
+    order = np.argsort(a, kind='stable')
+    breakpoints = a[order]
+    splines = []
+    for b in bs:
+        values = b[order]
+        steps = np.diff(values)
+        if (steps > 0).all() or (steps < 0).all():
+            ppoly = PchipInterpolator(breakpoints, values, extrapolate=False)
+        else:
+            ppoly = CubicSpline(breakpoints, values, extrapolate=False)
+        splines.append(_PiecewiseCubic(ppoly))
+    return splines
+
+@njit(cache=True)
+def _eval_piecewise(q, breaks, coeffs):
+    """
+    批量求分段多项式的值。coeffs 为 (区间数, 阶数) 的 C 连续数组，每行从高次到低次。
+    沿用上一个查询点的区间，未命中时才二分查找，有序查询摊还 O(1)；超出断点范围处为 NaN。
+    不启用 fastmath：越界和 NaN 输入依赖 NaN 的比较语义。
+    """
+    n = breaks.shape[0] - 1
+    k = coeffs.shape[1]
+    out = np.empty(q.shape[0])
+    lo = breaks[0]
+    hi = breaks[n]
+    i = 0
+    for j in range(q.shape[0]):
+        v = q[j]
+        if not (lo <= v <= hi):
+            out[j] = np.nan
+            continue
+        if not (breaks[i] <= v and (v < breaks[i + 1] or i == n - 1)):
+            i = min(np.searchsorted(breaks, v, side='right') - 1, n - 1)
+        dx = v - breaks[i]
+        acc = 0.0
+        for m in range(k):
+            acc = acc * dx + coeffs[i, m]
+        out[j] = acc
+    return out
+
+class _PiecewiseCubic:
+    """
+    带区间提示的分段三次多项式求值器，包装一个 PPoly (PchipInterpolator 或 CubicSpline)。
+
+    标量查询在 Python 中直接求值：先检查上一次命中的区间及其相邻区间，
+    连续、有序的查询 (如逐级计算、滑块拖动) 摊还 O(1)，未命中时才二分查找；
+    再用 Horner 法则计算多项式，避免 PPoly.__call__ 对单个数的数组化开销。
+    数组查询在安装了 numba 时由编译后的 _eval_piecewise 求值，否则交给 PPoly
+    (两者都沿用上一个点的区间)。超出断点范围时返回 NaN。
+    """
+    __slots__ = ('ppoly', 'x', 'c', '_breaks', '_coeffs', '_coeff_rows', '_lo', '_hi', '_last_i')
+
+    def __init__(self, ppoly):
+        """
+        :param ppoly: extrapolate=False 的 PPoly 对象
+        """
+        self.ppoly = ppoly
+        # 与 PPoly 相同的属性，便于直接访问断点和系数
+        self.x = ppoly.x
+        self.c = ppoly.c
+        # 标量路径使用的 Python 列表：断点和逐区间的系数 (从高次到低次)
+        self._breaks = ppoly.x.tolist()
+        self._coeffs = ppoly.c.T.tolist()
+        # 数组路径 (numba 核心) 使用的逐区间系数矩阵
+        self._coeff_rows = np.ascontiguousarray(ppoly.c.T)
+        self._lo = self._breaks[0]
+        self._hi = self._breaks[-1]
+        self._last_i = 0
+
+    def __call__(self, q):
+        if isinstance(q, (float, int, np.floating, np.integer)):
+            return self._eval_scalar(float(q))
+        if HAS_NUMBA:
+            q = np.asarray(q, dtype=np.float64)
+            return _eval_piecewise(q.ravel(), self.x, self._coeff_rows).reshape(q.shape)
+        return self.ppoly(q)
+
+    def _find_interval(self, q):
+        """返回满足 breaks[i] <= q < breaks[i+1] 的区间序号 (q 等于右端点时取最后一个区间)。"""
+        breaks = self._breaks
+        n = len(breaks) - 1
+        i = self._last_i
+        # 先检查上一次的区间，再检查其右、左相邻区间
+        if breaks[i] <= q and (q < breaks[i + 1] or i == n - 1):
+            return i
+        if i + 1 < n and breaks[i + 1] <= q and (q < breaks[i + 2] or i + 1 == n - 1):
+            i += 1
+        elif i > 0 and breaks[i - 1] <= q < breaks[i]:
+            i -= 1
+        else:
+            i = min(bisect_right(breaks, q) - 1, n - 1)
+        self._last_i = i
+        return i
+
+    def _eval_scalar(self, q):
+        # NaN 和超出范围的查询都不满足此条件
+        if not (self._lo <= q <= self._hi):
+            return np.nan
+        i = self._find_interval(q)
+        dx = q - self._breaks[i]
+        value = 0.0
+        for coeff in self._coeffs[i]:
+            value = value * dx + coeff
+        return value
+
+def _evaluate_family(splines, q):
+    """
+    对共享同一组断点的多个 _PiecewiseCubic 样条求值：区间只查找一次，各样条只做 Horner 计算。
+
+    :param splines: 断点数组完全相同的 _PiecewiseCubic 列表
+    :param q: 标量或数组形式的查询点
+    :return: 与 splines 顺序对应的求值结果列表，超出断点范围处为 NaN
+    """
+    first = splines[0]
+    if isinstance(q, (float, int, np.floating, np.integer)):
+        q = float(q)
+        if not (first._lo <= q <= first._hi):
+            return [np.nan] * len(splines)
+        i = first._find_interval(q)
+        dx = q - first._breaks[i]
+        values = []
+        for spline in splines:
+            value = 0.0
+            for coeff in spline._coeffs[i]:
+                value = value * dx + coeff
+            values.append(value)
+        return values
+
+    q = np.asarray(q, dtype=np.float64)
+    breaks = first.x
+    i = np.clip(np.searchsorted(breaks, q, side='right') - 1, 0, len(breaks) - 2)
+    dx = q - breaks[i]
+    outside = ~((q >= breaks[0]) & (q <= breaks[-1]))
+    values = []
+    for spline in splines:
+        c = spline.c[:, i]
+        value = c[0]
+        for k in range(1, c.shape[0]):
+            value = value * dx + c[k]
+        # 用 np.where 而不是原地赋值，0 维数组输入同样适用
+        values.append(np.where(outside, np.nan, value))
+    return values
+
+def _nan_ppoly():
+    """
+    没有足够相对挥发度数据时使用的插值函数：对任意输入返回 NaN。
+    与其他插值函数一样包装为 _PiecewiseCubic，标量查询返回 float 而不是 0 维数组。
+    """
+    return _PiecewiseCubic(PPoly(np.full((1, 1), np.nan), np.array([0.0, 1.0]), extrapolate=False))
 
 class VLE:
     """
@@ -14,106 +179,167 @@ class VLE:
         
         :param data_path: VLE数据文件的路径 (JSON格式)。
         """
-        with open(data_path, 'r') as f:
-            raw_data = json.load(f)
+        with open(data_path, 'rb') as f:
+            raw_data = _json.loads(f.read())
 
         self.name = raw_data.get("name", "Unnamed VLE Data")
         self.components = raw_data.get("components", ["A", "B"])
         self.data_points = raw_data["data"]
         
         # 提取数据用于插值
-        self.temps = np.array([point["temp"] for point in self.data_points])
-        self.y_values = np.array([point["y"] for point in self.data_points])
-        self.x_values = np.array([point["x"] for point in self.data_points])
+        # 单次遍历数据点，构造 (温度, x, y, α) 的连续 float64 列存储表，缺失的 α 记为 NaN
+        table = np.array(
+            [(point["temp"], point["x"], point["y"],
+              np.nan if point.get("alpha") is None else point["alpha"])
+             for point in self.data_points],
+            dtype=np.float64
+        ).reshape(-1, 4)
+        self.temps, self.x_values, self.y_values, alpha_column = np.ascontiguousarray(table.T)
         
         # 处理相对挥发度数据（可能不存在）
-        alpha_data_points = [point for point in self.data_points if point.get("alpha") is not None]
-        self.has_alpha = len(alpha_data_points) > 0
+        alpha_mask = ~np.isnan(alpha_column)
+        self.has_alpha = bool(alpha_mask.any())
 
         if self.has_alpha:
             # 只有有相对挥发度的数据点
-            alpha_data_points = [point for point in self.data_points if point.get("alpha") is not None]
-            self.alpha_temps = np.array([point["temp"] for point in alpha_data_points])
-            self.alpha_values = np.array([point["alpha"] for point in alpha_data_points])
-            self.alpha_x_values = np.array([point["x"] for point in alpha_data_points])
+            self.alpha_temps = self.temps[alpha_mask]
+            self.alpha_values = alpha_column[alpha_mask]
+            self.alpha_x_values = self.x_values[alpha_mask]
         
         # 创建插值函数
-        # 从液相组成(x)插值温度
-        self.temp_from_x = interp1d(self.x_values, self.temps, kind='cubic', bounds_error=False, fill_value=np.nan)
-        
-        # 从气相组成(y)插值温度
-        self.temp_from_y = interp1d(self.y_values, self.temps, kind='cubic', bounds_error=False, fill_value=np.nan)
-        
-        # 从液相组成(x)插值气相组成(y)
-        self.y_from_x = interp1d(self.x_values, self.y_values, kind='cubic', bounds_error=False, fill_value=np.nan)
-        
-        # 从气相组成(y)插值液相组成(x)
-        self.x_from_y = interp1d(self.y_values, self.x_values, kind='cubic', bounds_error=False, fill_value=np.nan)
-        
-        # 从温度插值液相组成(x)
-        self.x_from_temp = interp1d(self.temps, self.x_values, kind='cubic', bounds_error=False, fill_value=np.nan)
-        
-        # 从温度插值气相组成(y)
-        self.y_from_temp = interp1d(self.temps, self.y_values, kind='cubic', bounds_error=False, fill_value=np.nan)
-        
-        # 相对挥发度插值函数（如果数据存在）
-        if self.has_alpha:
-            if len(self.alpha_x_values) > 1:
-                self.alpha_from_x = interp1d(self.alpha_x_values, self.alpha_values, kind='cubic', bounds_error=False, fill_value=np.nan)
-                self.alpha_from_temp = interp1d(self.alpha_temps, self.alpha_values, kind='cubic', bounds_error=False, fill_value=np.nan)
-            else:
-                self.alpha_from_x = lambda x: np.full_like(x, np.nan) if hasattr(x, '__len__') else np.nan
-                self.alpha_from_temp = lambda t: np.full_like(t, np.nan) if hasattr(t, '__len__') else np.nan
+        # 单调曲线使用 PCHIP，其余使用三次样条 (见 _cubic_splines)；
+        # 同一自变量上的插值函数一起构造，只排序一次
+        # 从液相组成(x)插值温度、气相组成(y)
+        self.temp_from_x, self.y_from_x = _cubic_splines(self.x_values, self.temps, self.y_values)
+        # 以气相组成、温度为自变量的反向插值函数在首次使用时才构造 (见下方的 cached_property)
+        
+        # 线性插值快速路径使用的 x 升序节点 (np.interp 要求横坐标递增)，即 y(x) 样条的断点
+        x_order = np.argsort(self.x_values, kind='stable')
+        self._x_sorted = self.y_from_x.x
+        self._y_by_x_sorted = self.y_values[x_order]
+        self._temp_by_x_sorted = self.temps[x_order]
+        
+        # 相对挥发度插值函数（如果数据存在，至少需要两个点）
+        if self._has_alpha_spline:
+            self.alpha_from_x, = _cubic_splines(self.alpha_x_values, self.alpha_values)
         else:
-            self.alpha_from_x = lambda x: np.full_like(x, np.nan) if hasattr(x, '__len__') else np.nan
-            self.alpha_from_temp = lambda t: np.full_like(t, np.nan) if hasattr(t, '__len__') else np.nan
+            self.alpha_from_x = _nan_ppoly()
+        
+        # 共享同一组断点的样条族，get_all_properties_* 对同一查询点只做一次区间查找；
+        # 只有每个数据点都有相对挥发度时，α 样条才与 x (或温度) 上的样条断点相同
+        self._x_family = [self.temp_from_x, self.y_from_x]
+        if np.array_equal(self.alpha_from_x.x, self.y_from_x.x):
+            self._x_family.append(self.alpha_from_x)
+
+    @property
+    def _has_alpha_spline(self):
+        return self.has_alpha and len(self.alpha_x_values) > 1
+
+    # 反向插值函数：Dash 界面和逐级计算通常只用到 y(x) 与 x(y)，
+    # 其余插值函数在首次访问时构造并缓存，减少构造 VLE 的开销和内存
+    @cached_property
+    def temp_from_y(self):
+        """从气相组成(y)插值温度"""
+        return _cubic_splines(self.y_values, self.temps)[0]
+
+    @cached_property
+    def x_from_y(self):
+        """从气相组成(y)插值液相组成(x)"""
+        return _cubic_splines(self.y_values, self.x_values)[0]
+
+    @cached_property
+    def x_from_temp(self):
+        """从温度插值液相组成(x)"""
+        return _cubic_splines(self.temps, self.x_values)[0]
+
+    @cached_property
+    def y_from_temp(self):
+        """从温度插值气相组成(y)"""
+        return _cubic_splines(self.temps, self.y_values)[0]
+
+    @cached_property
+    def alpha_from_temp(self):
+        """从温度插值相对挥发度"""
+        if self._has_alpha_spline:
+            return _cubic_splines(self.alpha_temps, self.alpha_values)[0]
+        return _nan_ppoly()
+
+    @cached_property
+    def _by_y_sorted(self):
+        """以气相组成为自变量的线性插值快速路径使用的 (y 升序节点, 对应的 x, 对应的温度)"""
+        y_order = np.argsort(self.y_values, kind='stable')
+        return self.y_values[y_order], self.x_values[y_order], self.temps[y_order]
+
+    @cached_property
+    def _temp_family(self):
+        """以温度为自变量、共享同一组断点的样条族"""
+        family = [self.x_from_temp, self.y_from_temp]
+        if np.array_equal(self.alpha_from_temp.x, self.y_from_temp.x):
+            family.append(self.alpha_from_temp)
+        return family
     
-    def get_temperature_by_x(self, x):
+    def get_temperature_by_x(self, x, fast: bool = False):
         """
         根据液相组分1摩尔分数获取温度
         
         参数:
         x : float or array-like - 液相组分1摩尔分数 (0.0 - 1.0)
+        fast : bool - 为 True 时使用 np.interp 在数据点之间线性插值 (同 get_y_by_x)
         
         返回:
         float or array - 温度 (°C)
         """
+        if fast:
+            return np.interp(x, self._x_sorted, self._temp_by_x_sorted, left=np.nan, right=np.nan)
         return self.temp_from_x(x)
     
-    def get_temperature_by_y(self, y):
+    def get_temperature_by_y(self, y, fast: bool = False):
         """
         根据气相组分1摩尔分数获取温度
         
         参数:
         y : float or array-like - 气相组分1摩尔分数 (0.0 - 1.0)
+        fast : bool - 为 True 时使用 np.interp 在数据点之间线性插值 (同 get_y_by_x)
         
         返回:
         float or array - 温度 (°C)
         """
+        if fast:
+            y_sorted, _, temp_by_y = self._by_y_sorted
+            return np.interp(y, y_sorted, temp_by_y, left=np.nan, right=np.nan)
         return self.temp_from_y(y)
     
-    def get_y_by_x(self, x):
+    def get_y_by_x(self, x, fast: bool = False):
         """
         根据液相组分1摩尔分数获取气相组分1摩尔分数
         
         参数:
         x : float or array-like - 液相组分1摩尔分数 (0.0 - 1.0)
+        fast : bool - 为 True 时使用 np.interp 在数据点之间线性插值，
+               省去三次样条的求值开销，适合对精度要求不高的交互式场景
         
         返回:
         float or array - 气相组分1摩尔分数 (0.0 - 1.0)
         """
+        if fast:
+            # 与样条插值一致，超出数据范围时返回 NaN
+            return np.interp(x, self._x_sorted, self._y_by_x_sorted, left=np.nan, right=np.nan)
         return self.y_from_x(x)
     
-    def get_x_by_y(self, y):
+    def get_x_by_y(self, y, fast: bool = False):
         """
         根据气相组分1摩尔分数获取液相组分1摩尔分数
         
         参数:
         y : float or array-like - 气相组分1摩尔分数 (0.0 - 1.0)
+        fast : bool - 为 True 时使用 np.interp 在数据点之间线性插值 (同 get_y_by_x)
         
         返回:
         float or array - 液相组分1摩尔分数 (0.0 - 1.0)
         """
+        if fast:
+            y_sorted, x_by_y, _ = self._by_y_sorted
+            return np.interp(y, y_sorted, x_by_y, left=np.nan, right=np.nan)
         return self.x_from_y(y)
     
     def get_alpha_by_x(self, x):
@@ -174,9 +400,9 @@ class VLE:
         返回:
         dict - 包含温度、气相组成、相对挥发度的字典
         """
-        temp = self.get_temperature_by_x(x)
-        y = self.get_y_by_x(x)
-        alpha = self.get_alpha_by_x(x)
+        # 温度、气相组成 (以及可能的相对挥发度) 共用一次区间查找
+        temp, y, *alpha = _evaluate_family(self._x_family, x)
+        alpha = alpha[0] if alpha else self.get_alpha_by_x(x)
         return {
             "temperature": temp,
             "vapor_composition": y,
@@ -194,9 +420,9 @@ class VLE:
         返回:
         dict - 包含液相组成、气相组成、相对挥发度的字典
         """
-        x = self.get_x_by_temp(temp)
-        y = self.get_y_by_temp(temp)
-        alpha = self.get_alpha_by_temp(temp)
+        # 液相、气相组成 (以及可能的相对挥发度) 共用一次区间查找
+        x, y, *alpha = _evaluate_family(self._temp_family, temp)
+        alpha = alpha[0] if alpha else self.get_alpha_by_temp(temp)
         return {
             "temperature": temp,
             "vapor_composition": y,
@@ -227,16 +453,17 @@ class VLE:
         打印完整的数据表
         """
         comp_a, comp_b = self.components
-        print(f"{self.name}")
-        print(f"{'Temp (℃)':<10} {'Vapor mole frac of ' + comp_a:<25} {'Liquid mole frac of ' + comp_a:<25} {'Relative volatility (α)':<25}")
-        print("-" * 85)
+        lines = [
+            f"{self.name}",
+            f"{'Temp (℃)':<10} {'Vapor mole frac of ' + comp_a:<25} {'Liquid mole frac of ' + comp_a:<25} {'Relative volatility (α)':<25}",
+            "-" * 85,
+        ]
         for point in self.data_points:
-            temp = point["temp"]
-            y = point["y"]
-            x = point["x"]
             alpha = point.get("alpha")
             alpha_str = f"{alpha:.2f}" if alpha is not None else ""
-            print(f"{temp:<10.1f} {y:<25.3f} {x:<25.3f} {alpha_str:<25}")
+            lines.append(f"{point['temp']:<10.1f} {point['y']:<25.3f} {point['x']:<25.3f} {alpha_str:<25}")
+        # 整张表拼接后一次写出，不再逐行调用 print
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 # 示例使用
@@ -1,11 +1,228 @@
 # chemetk/unit_ops/distillation.py
+import sys
+import weakref
+
+import numpy as np
 import pandas as pd
 
+from .._numba_compat import njit, prange
+
+# 逐级计算的最大迭代次数 (安全保护，避免无限循环)
+_MAX_STAGES = 150
+# 平衡曲线查找表的点数
+_TABLE_SIZE = 4096
+# 塔段类别，section 列以分类编码存储: 0=精馏段, 1=提馏段, 2=全回流段
+# (级数不超过 _MAX_STAGES + 1，stage 列使用 int16；组成等浮点列保持 float64，小数级数插值需要其精度)
+_SECTION_CATEGORIES = ['精馏段', '提馏段', '全回流段']
+
+def _tabulate(func, lo, hi, n=_TABLE_SIZE):
+    """在 [lo, hi] 上等距采样插值函数，生成供计算核心查表用的只读数组"""
+    table = np.ascontiguousarray(func(np.linspace(lo, hi, n)), dtype=np.float64)
+    table.flags.writeable = False
+    return table
+
+# 平衡曲线查找表缓存：以 VLE 实例的弱引用为键，VLE 被回收时对应的表随之释放
+_VLE_TABLES = weakref.WeakKeyDictionary()
+
+def _vle_tables(vle):
+    """
+    生成 VLE 的平衡曲线查找表：y(x) 与 x(y) 各一张，一次向量化插值完成。
+    按 VLE 实例缓存，同一体系的多个 McCabeThiele 实例 (如参数扫描、Web 回调) 共享同一组表。
+
+    :return: ((x_min, x_max), y(x) 表, (y_min, y_max), x(y) 表)
+    """
+    tables = _VLE_TABLES.get(vle)
+    if tables is None:
+        x_range = (float(np.min(vle.x_values)), float(np.max(vle.x_values)))
+        y_range = (float(np.min(vle.y_values)), float(np.max(vle.y_values)))
+        tables = (x_range, _tabulate(vle.get_y_by_x, *x_range),
+                  y_range, _tabulate(vle.get_x_by_y, *y_range))
+        _VLE_TABLES[vle] = tables
+    return tables
+
+@njit(cache=True)
+def _lookup(v, lo, hi, table):
+    """
+    等距查找表上的线性插值，O(1) 定位区间。
+    超出 [lo, hi] 范围时返回 NaN，与 VLE 插值函数 (bounds_error=False, fill_value=nan) 的行为一致。
+    """
+    if not (lo <= v <= hi):
+        return np.nan
+    t = (v - lo) / (hi - lo) * (table.size - 1)
+    i = min(int(t), table.size - 2)
+    return table[i] + (table[i + 1] - table[i]) * (t - i)
+
+@njit(cache=True)
+def _march_stages_top(x_D, x_W, L_V, DxD_V, Lp_Vp, WxW_Vp, x_int, E_ml,
+                      y_lo, y_hi, x_of_y, max_stages):
+    """
+    从塔顶逐级计算的核心循环。
+    全回流时由调用方传入 y = x 的操作线系数 (斜率 1，截距 0)，核心循环无需单独分支。
+    返回 (液相组成数组, 气相组成数组, 级数, 是否达到迭代上限)。
+    """
+    xs = np.empty(max_stages + 1)
+    ys = np.empty(max_stages + 1)
+    n = 0
+    current_x = x_D
+    current_y = x_D  # 塔顶气相组成等于馏出液组成
+
+    # 迭代次数上限由 range 保证，循环内只需判断是否已达到目标组成 (NaN 时同样终止)
+    for _ in range(max_stages):
+        if not current_x > x_W:
+            break
+        xs[n] = current_x
+        ys[n] = current_y
+        n += 1
+
+        # 两条操作线都很廉价，先全部算出再按切换点选择 (编译为条件传送，无分支预测失败)
+        next_y_rectifying = L_V * current_x + DxD_V
+        next_y_stripping = Lp_Vp * current_x - WxW_Vp
+        next_y = next_y_rectifying if current_x > x_int else next_y_stripping
+
+        # 由平衡关系求 x*，再按液相Murphree效率: x_n = x_{n-1} - E_ml * (x_{n-1} - x*_n)
+        x_equilibrium_next = _lookup(next_y, y_lo, y_hi, x_of_y)
+        current_x = current_x - E_ml * (current_x - x_equilibrium_next)
+        current_y = next_y
+
+    capped = n == max_stages
+
+    # 记录最后一级
+    if n > 0 and current_x <= x_W:
+        xs[n] = current_x
+        ys[n] = current_y
+        n += 1
+
+    return xs[:n], ys[:n], n, capped
+
+@njit(cache=True)
+def _march_stages_bottom(x_D, x_W, V, DxD, L, Vp, WxW, Lp, x_int, E_mv,
+                         x_lo, x_hi, y_of_x, max_stages):
+    """
+    从塔釜逐级计算的核心循环。
+    全回流时由调用方传入 x = y 的操作线系数 (流量为 1，D*x_D 与 W*x_W 为 0)，核心循环无需单独分支。
+    返回 (液相组成数组, 实际气相组成数组, 平衡气相组成数组, 级数, 是否达到迭代上限)。
+    """
+    xs = np.empty(max_stages + 1)
+    ys_actual = np.empty(max_stages + 1)
+    ys_equilibrium = np.empty(max_stages + 1)
+    n = 0
+    current_x = x_W
+    current_y_equilibrium = _lookup(x_W, x_lo, x_hi, y_of_x)
+    current_y_actual = current_y_equilibrium  # 塔釜通常视为平衡状态
+
+    # 迭代次数上限由 range 保证，循环内只需判断是否已达到目标组成 (NaN 时同样终止)
+    for _ in range(max_stages):
+        if not current_y_actual < x_D:
+            break
+        xs[n] = current_x
+        ys_actual[n] = current_y_actual
+        ys_equilibrium[n] = current_y_equilibrium
+        n += 1
+
+        # 两条操作线都很廉价，先全部算出再按切换点选择 (编译为条件传送，无分支预测失败)
+        next_x_stripping = (Vp * current_y_actual + WxW) / Lp
+        next_x_rectifying = (V * current_y_actual - DxD) / L
+        next_x = next_x_stripping if current_x <= x_int else next_x_rectifying
+
+        # 由平衡关系求 y*，再按气相Murphree效率: y_n = y_{n-1} + E_mv * (y*_n - y_{n-1})
+        y_equilibrium_next = _lookup(next_x, x_lo, x_hi, y_of_x)
+        current_y_actual = current_y_actual + E_mv * (y_equilibrium_next - current_y_actual)
+        current_x = next_x
+        current_y_equilibrium = y_equilibrium_next
+
+    capped = n == max_stages
+
+    # 记录最后一级
+    if n > 0 and current_y_actual >= x_D:
+        xs[n] = current_x
+        ys_actual[n] = current_y_actual
+        ys_equilibrium[n] = current_y_equilibrium
+        n += 1
+
+    return xs[:n], ys_actual[:n], ys_equilibrium[:n], n, capped
+
+@njit(cache=True)
+def _q_line_intersection(q, x_F, L_V, DxD_V):
+    """
+    精馏段操作线 y = (L/V)x + D*xD/V 与 q 线交点的 x 坐标 (非全回流时)。
+    q 接近 1 (饱和液体) 或 0 (饱和蒸汽) 时 q 线垂直或水平，直接取特殊解；
+    判断使用 np.isclose 的默认容差 (rtol=1e-5, atol=1e-8)，McCabeThiele 与回流比扫描共用。
+    """
+    if abs(q - 1.0) <= 1e-8 + 1e-5:
+        return x_F
+    if abs(q) <= 1e-8:
+        # 从 y = (L/V)x + D*xD/V 反解 x
+        return (x_F - DxD_V) / L_V
+    m_q = q / (q - 1.0)  # q线的斜率
+    b_q = x_F - m_q * x_F  # q线的截距 y = m_q*x + b_q
+    # 联立精馏段操作线: (m_q - L/V)x = D*xD/V - b_q
+    return (DxD_V - b_q) / (m_q - L_V)
+
+@njit(cache=True, parallel=True)
+def _sweep_stages_top(x_D, x_W, x_F, q, R_values, D, F, W, E_ml, y_lo, y_hi, x_of_y, max_stages):
+    """
+    对一组回流比并行执行从塔顶开始的逐级计算，返回各回流比下的理论级数。
+    操作线参数的计算与 McCabeThiele 一致，交点同样由 _q_line_intersection 计算 (q 的特殊情况判断相同)。
+    """
+    stages = np.empty(R_values.size, dtype=np.int32)
+    for k in prange(R_values.size):
+        R = R_values[k]
+        V = (R + 1.0) * D
+        L_prime = R * D + q * F
+        V_prime = V - (1.0 - q) * F
+        L_V = R / (R + 1.0)
+        DxD_V = D * x_D / V
+        Lp_Vp = L_prime / V_prime
+        WxW_Vp = W * x_W / V_prime
+        x_int = _q_line_intersection(q, x_F, L_V, DxD_V)
+        n = _march_stages_top(x_D, x_W, L_V, DxD_V, Lp_Vp, WxW_Vp, x_int, E_ml,
+                              y_lo, y_hi, x_of_y, max_stages)[2]
+        stages[k] = n
+    return stages
+
+def sweep_reflux_ratio(vle, x_D: float, x_W: float, x_F: float, q: float, R_values,
+                       D: float, F: float, W: float, murphree_efficiency: float = 1.0) -> np.ndarray:
+    """
+    回流比扫描：并行计算一组回流比下的整数理论级数 (从塔顶开始计算)。
+    安装 numba 时各回流比在多个线程上并行计算，否则顺序计算。
+
+    :param vle: VLE实例
+    :param x_D: 馏出液组成
+    :param x_W: 釜液组成
+    :param x_F: 进料组成
+    :param q: 进料热状态参数
+    :param R_values: 回流比数组
+    :param D: 馏出液流量
+    :param F: 进料流量
+    :param W: 釜液流量
+    :param murphree_efficiency: 液相Murphree效率
+    :return: 与 R_values 对应的理论级数数组 (达到迭代上限时为 150)
+    """
+    if F == 0 and D == 0 and W == 0:
+        raise ValueError("回流比扫描不适用于全回流操作 (F, D, W 均为 0)")
+    R_values = np.ascontiguousarray(R_values, dtype=np.float64)
+    _, _, y_range, x_of_y = _vle_tables(vle)
+    return _sweep_stages_top(
+        float(x_D), float(x_W), float(x_F), float(q), R_values,
+        float(D), float(F), float(W), float(murphree_efficiency),
+        y_range[0], y_range[1], x_of_y, _MAX_STAGES
+    )
+
 class McCabeThiele:
     """
     使用McCabe-Thiele法进行二元精馏塔的理论塔板计算。
     支持常规操作和全回流操作。
     """
+    # 固定属性集合：属性访问走槽位偏移而非实例字典，同时减少每个实例的内存
+    __slots__ = (
+        'vle', 'x_D', 'x_W', 'x_F', 'q', 'R', 'D', 'F', 'W', 'total_reflux',
+        'L', 'V', 'L_prime', 'V_prime',
+        'L_over_V', 'D_xD_over_V', 'L_prime_over_V_prime', 'W_xW_over_V_prime',
+        'x_intersect', 'y_intersect',
+        '_stages_cache', '_x_range', '_y_of_x', '_y_range', '_x_of_y',
+        '_top_line', '_bottom_line', '_inputs',
+    )
+
     def __init__(self, vle, x_D: float, x_W: float, x_F: float, q: float, 
                  R: float, D: float = 0., F: float = 0., W: float = 0.):
         """
@@ -30,9 +247,26 @@ class McCabeThiele:
         self.D = D
         self.F = F
         self.W = W
+        self._update()
+
+    def _current_inputs(self):
+        """当前的输入参数元组，用于判断初始化后参数是否被重新赋值"""
+        return (self.vle, self.x_D, self.x_W, self.x_F, self.q, self.R, self.D, self.F, self.W)
+
+    def _update(self):
+        """
+        根据当前参数计算操作线参数、交点和逐级计算核心的参数，并清空逐级计算结果缓存。
+        初始化时调用一次，之后由 _sync 在参数被重新赋值时调用。
+        """
+        self._inputs = self._current_inputs()
+        vle, x_D, x_W, x_F, q, R, D, F, W = self._inputs
+        # 平衡曲线查找表：在数据范围内等距采样 VLE 插值函数，供逐级计算核心使用
+        self._x_range, self._y_of_x, self._y_range, self._x_of_y = _vle_tables(vle)
+        # 逐级计算结果缓存: {(start_from, murphree_efficiency, return_decimal_stages): 结果}
+        self._stages_cache = {}
         
         # 判断是否为全回流操作
-        self.total_reflux = (float(F) == 0. and float(D) == 0. and float(W) == 0.)
+        self.total_reflux = (F == 0 and D == 0 and W == 0)
         
         if self.total_reflux:
             print("检测到全回流操作模式")
@@ -59,286 +293,283 @@ class McCabeThiele:
             self.L_prime_over_V_prime = self.L_prime / self.V_prime
             self.W_xW_over_V_prime = W * x_W / self.V_prime
             
-            # ---------- <<< 修改开始 >>> ----------
             # 计算操作线的交点，作为正确的切换点
-            if q == 1:
-                self.x_intersect = x_F
-            elif q == 0:
-                y_int_temp = x_F
-                # 从 y = (L/V)x + D*xD/V 反解 x
-                self.x_intersect = (y_int_temp - self.D_xD_over_V) / self.L_over_V
-            else:
-                m_q = q / (q-1) # q线的斜率
-                b_q = x_F - m_q * x_F # q线的截距 y = m_q*x + b_q
-                # 联立精馏段操作线 y = (L/V)x + D*xD/V
-                # m_q*x + b_q = (L/V)x + D*xD/V
-                # (m_q - L/V)x = D*xD/V - b_q
-                self.x_intersect = (self.D_xD_over_V - b_q) / (m_q - self.L_over_V)
-            
-            # 计算交点的 y 坐标
-            self.y_intersect = self.L_over_V * self.x_intersect + self.D_xD_over_V
+            self.x_intersect, self.y_intersect = self._compute_intersection()
             print(f"操作线交点计算: x_intersect = {self.x_intersect:.4f}, y_intersect = {self.y_intersect:.4f}")
-            # ---------- <<< 修改结束 >>> ----------
+        
+        # 逐级计算核心所需的参数，初始化时一次性转换为 float，避免每次计算时重复转换
+        if self.total_reflux:
+            # 全回流操作线 y = x，切换点无意义
+            self._top_line = (float(x_D), float(x_W), 1.0, 0.0, 1.0, 0.0, 0.0)
+            self._bottom_line = (float(x_D), float(x_W), 1.0, 0.0, 1.0, 1.0, 0.0, 1.0, 0.0)
+        else:
+            self._top_line = tuple(map(float, (
+                x_D, x_W, self.L_over_V, self.D_xD_over_V,
+                self.L_prime_over_V_prime, self.W_xW_over_V_prime, self.x_intersect
+            )))
+            self._bottom_line = tuple(map(float, (
+                x_D, x_W, self.V, D * x_D, self.L,
+                self.V_prime, W * x_W, self.L_prime, self.x_intersect
+            )))
+
+    def _compute_intersection(self):
+        """
+        计算精馏段操作线与 q 线的交点 (非全回流时)，与回流比扫描共用 _q_line_intersection。
+
+        :return: (x_intersect, y_intersect)
+        """
+        x_int = _q_line_intersection(float(self.q), float(self.x_F),
+                                     float(self.L_over_V), float(self.D_xD_over_V))
+        # 计算交点的 y 坐标
+        y_int = self.L_over_V * x_int + self.D_xD_over_V
+        return x_int, y_int
+
+    @property
+    def intersection_point(self):
+        """操作线交点 (x_intersect, y_intersect)，在初始化 (或修改参数) 时计算一次。"""
+        self._sync()
+        return self.x_intersect, self.y_intersect
+
+    def _sync(self):
+        """
+        初始化后重新设置了 vle、x_D、R、q 等参数时，重新计算操作线参数和交点并清空逐级计算结果缓存，
+        避免返回按旧参数计算的结果。参数未变化时只做一次元组比较。
+        """
+        if self._current_inputs() != self._inputs:
+            self._update()
 
     def calculate_stages(self, start_from: str = 'top', murphree_efficiency: float = 1.0,
-                        return_decimal_stages: bool = False):
+                        return_decimal_stages: bool = False, verbose: bool = False):
         """
         计算理论塔板数。
         
         :param start_from: 'top' 或 'bottom'，决定从塔顶还是塔釜开始计算。
         :param murphree_efficiency: 默弗里塔板效率 (0 to 1.0)，从塔顶计算使用液相Murphree效率，从塔釜计算使用气相Murphree效率。
         :param return_decimal_stages: 是否返回小数形式的理论级数（用于全塔板效率计算）
+        :param verbose: 是否打印逐级计算过程
         :return: 如果return_decimal_stages为True，返回(塔板DataFrame, 小数理论级数)；否则返回塔板DataFrame
         """
+        self._sync()
+        # 相同参数的结果直接从缓存返回 (返回副本，避免调用方的修改污染缓存)；
+        # verbose=True 时总是重新计算以打印计算过程
+        cache_key = (start_from, murphree_efficiency, return_decimal_stages)
+        if not verbose and cache_key in self._stages_cache:
+            cached = self._stages_cache[cache_key]
+            if return_decimal_stages:
+                return cached[0].copy(), cached[1]
+            return cached.copy()
+        
         if start_from == 'top':
-            result = self._calculate_from_top(murphree_efficiency)
+            result = self._calculate_from_top(murphree_efficiency, verbose)
         elif start_from == 'bottom':
-            result = self._calculate_from_bottom(murphree_efficiency)
+            result = self._calculate_from_bottom(murphree_efficiency, verbose)
         else:
             raise ValueError("start_from must be 'top' or 'bottom'")
         
         if return_decimal_stages:
-            decimal_stages = self._calculate_decimal_stages(result, start_from)
-            return result, decimal_stages
+            # 从塔顶计算时按液相组成插值，从塔釜计算时按实际气相组成插值
+            profile = result['x_liquid' if start_from == 'top' else 'y_vapor_actual'].to_numpy()
+            decimal_stages = self._calculate_decimal_stages(profile, start_from, verbose)
+            self._stages_cache[cache_key] = (result, decimal_stages)
+            return result.copy(), decimal_stages
         else:
-            return result
+            self._stages_cache[cache_key] = result
+            return result.copy()
 
-    def _calculate_from_top(self, E_ml: float = 1.0):
+    def calculate_stage_arrays(self, murphree_efficiency: float = 1.0):
+        """
+        从塔顶逐级计算，只返回绘制阶梯图所需的 NumPy 数组 (不构造 DataFrame，不插值温度和相对挥发度)。
+        供 Dash 回调等需要频繁重绘的场景使用；结果按效率缓存，返回的数组为只读。
+        
+        :param murphree_efficiency: 液相Murphree效率 (0 to 1.0)
+        :return: {'stage': 级号, 'x_liquid': 液相组成, 'y_vapor': 气相组成}
+        """
+        self._sync()
+        cache_key = ('arrays', murphree_efficiency)
+        cached = self._stages_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        x_liquid, y_vapor, n, capped = _march_stages_top(
+            *self._top_line, float(murphree_efficiency),
+            self._y_range[0], self._y_range[1], self._x_of_y, _MAX_STAGES
+        )
+        if capped:
+            print("警告: 迭代次数超过150次，强制停止")
+        arrays = {
+            'stage': np.arange(1, n + 1, dtype=np.int16),
+            'x_liquid': x_liquid,
+            'y_vapor': y_vapor,
+        }
+        for arr in arrays.values():
+            arr.flags.writeable = False
+        self._stages_cache[cache_key] = arrays
+        return arrays
+
+    def _calculate_from_top(self, E_ml: float = 1.0, verbose: bool = False):
         """
         从塔顶开始迭代计算精馏塔的理论塔板数，考虑液相Murphree效率。
         
         :param E_ml: 液相Murphree效率
+        :param verbose: 是否打印逐级计算过程
         :return: 每级塔板的信息DataFrame
         """
-        stages = []
-        stage_number = 1
+        x_liquid, y_vapor, n, capped = _march_stages_top(
+            *self._top_line, float(E_ml),
+            self._y_range[0], self._y_range[1], self._x_of_y, _MAX_STAGES
+        )
         
-        # 从塔顶开始计算 (x = x_D)
-        current_x = self.x_D
-        current_y = self.x_D  # 塔顶气相组成等于馏出液组成
+        # 温度和相对挥发度与逐级计算无关，计算结束后一次性批量插值 (结果已是 float64 数组)
+        temperature = self.vle.get_temperature_by_x(x_liquid)
+        alpha = self.vle.get_alpha_by_x(x_liquid)
+        efficiency = np.full(n, E_ml, dtype=np.float64)
+        efficiency[:1] = 1.0  # 塔顶效率为1
+        section = self._get_sections(x_liquid)
         
-        print("从塔顶开始塔板迭代计算 (考虑液相Murphree效率)...")
-        print(f"目标釜液组成 x_W = {self.x_W}")
-        print(f"液相Murphree效率 E_ml = {E_ml}")
-        if self.total_reflux:
-            print("操作模式: 全回流")
-        print("-" * 80)
-        
-        while current_x > self.x_W:
-            # 记录当前级信息
-            stage_info = {
-                'stage': stage_number,
-                'x_liquid': current_x,
-                'y_vapor': current_y,
-                'temperature': float(self.vle.get_temperature_by_x(current_x)),
-                'relative_volatility': float(self.vle.get_alpha_by_x(current_x)),
-                'efficiency': E_ml if stage_number > 1 else 1.0,  # 塔顶效率为1
-                'section': self._get_section(current_x)
-            }
-            stages.append(stage_info)
-            
-            # 打印当前级信息
-            print(f"第{stage_number:2d}级: x = {current_x:.4f}, y = {current_y:.4f}, "
-                  f"温度 = {stage_info['temperature']:.1f}°C, 段别 = {stage_info['section']}")
-            
-            # 计算下一级的气相组成
+        reached = n > 0 and x_liquid[-1] <= self.x_W
+        if verbose:
+            # 计算过程先缓存为行列表，结束后一次性输出
+            lines = [
+                "从塔顶开始塔板迭代计算 (考虑液相Murphree效率)...",
+                f"目标釜液组成 x_W = {self.x_W}",
+                f"液相Murphree效率 E_ml = {E_ml}",
+            ]
             if self.total_reflux:
-                # 全回流操作线: y = x
-                next_y = current_x
-            else:
-                # ---------- <<< 修改开始 >>> ----------
-                # 使用正确的切换点 x_intersect
-                if current_x > self.x_intersect:
-                # ---------- <<< 修改结束 >>> ----------
-                    # 精馏段操作线
-                    next_y = self.L_over_V * current_x + self.D_xD_over_V
-                else:
-                    # 提馏段操作线
-                    next_y = self.L_prime_over_V_prime * current_x - self.W_xW_over_V_prime
-            
-            # 通过平衡关系由y求平衡液相组成 x*
-            x_equilibrium_next = float(self.vle.get_x_by_y(next_y))
-            
-            # 使用液相Murphree效率计算实际液相组成
-            # 对于从上往下的计算: x_n = x_{n-1} - E_ml * (x_{n-1} - x*_n)
-            # 其中 x_{n-1} 是上一级的液相组成 (当前级的 current_x)
-            x_actual_next = current_x - E_ml * (current_x - x_equilibrium_next)
-            
-            # 更新为下一级的值
-            current_x = x_actual_next
-            current_y = next_y
-            stage_number += 1
-            
-            # 安全保护，避免无限循环
-            if stage_number > 150:  # 增加安全保护次数
-                print("警告: 迭代次数超过150次，强制停止")
-                break
-        
-        # 记录最后一级
-        if stages and current_x <= self.x_W:
-            final_stage = {
-                'stage': stage_number,
-                'x_liquid': current_x,
-                'y_vapor': current_y,
-                'temperature': float(self.vle.get_temperature_by_x(current_x)),
-                'relative_volatility': float(self.vle.get_alpha_by_x(current_x)),
-                'efficiency': E_ml,
-                'section': self._get_section(current_x)
-            }
-            stages.append(final_stage)
-            print(f"第{stage_number:2d}级: x = {current_x:.4f}, y = {current_y:.4f}, "
-                  f"温度 = {final_stage['temperature']:.1f}°C, 段别 = {final_stage['section']}")
-            print(f"达到目标釜液组成 x_W = {self.x_W}")
+                lines.append("操作模式: 全回流")
+            lines.append("-" * 80)
+            for i in range(n):
+                if reached and i == n - 1 and capped:
+                    lines.append("警告: 迭代次数超过150次，强制停止")
+                lines.append(f"第{i + 1:2d}级: x = {x_liquid[i]:.4f}, y = {y_vapor[i]:.4f}, "
+                             f"温度 = {temperature[i]:.1f}°C, 段别 = {section[i]}")
+            if capped and not reached:
+                lines.append("警告: 迭代次数超过150次，强制停止")
+            if reached:
+                lines.append(f"达到目标釜液组成 x_W = {self.x_W}")
+            print("\n".join(lines))
+        elif capped:
+            print("警告: 迭代次数超过150次，强制停止")
         
-        return pd.DataFrame(stages)
+        return pd.DataFrame({
+            'stage': np.arange(1, n + 1, dtype=np.int16),
+            'x_liquid': x_liquid,
+            'y_vapor': y_vapor,
+            'temperature': temperature,
+            'relative_volatility': alpha,
+            'efficiency': efficiency,
+            'section': section
+        })
 
-    def _calculate_from_bottom(self, E_mv: float = 1.0):
+    def _calculate_from_bottom(self, E_mv: float = 1.0, verbose: bool = False):
         """
         从塔釜开始迭代计算精馏塔的理论塔板数，考虑气相Murphree效率。
         
         :param E_mv: 气相Murphree效率
+        :param verbose: 是否打印逐级计算过程
         :return: 每级塔板的信息DataFrame
         """
-        stages = []
-        stage_number = 1
+        x_liquid, y_actual, y_equilibrium, n, capped = _march_stages_bottom(
+            *self._bottom_line, float(E_mv),
+            self._x_range[0], self._x_range[1], self._y_of_x, _MAX_STAGES
+        )
         
-        # 从塔釜开始计算 (x = x_W)
-        current_x = self.x_W
-        current_y_equilibrium = float(self.vle.get_y_by_x(self.x_W))  # 平衡气相组成
-        current_y_actual = current_y_equilibrium  # 塔釜通常视为平衡状态
-        
-        print("从塔釜开始塔板迭代计算 (考虑气相Murphree效率)...")
-        print(f"目标馏出液组成 x_D = {self.x_D}")
-        print(f"气相Murphree效率 E_mv = {E_mv}")
-        if self.total_reflux:
-            print("操作模式: 全回流")
-        print("-" * 80)
+        # 温度和相对挥发度与逐级计算无关，计算结束后一次性批量插值 (结果已是 float64 数组)
+        temperature = self.vle.get_temperature_by_x(x_liquid)
+        alpha = self.vle.get_alpha_by_x(x_liquid)
+        efficiency = np.full(n, E_mv, dtype=np.float64)
+        efficiency[:1] = 1.0  # 塔釜效率为1
+        section = self._get_sections(x_liquid)
         
-        while current_y_actual < self.x_D:
-            # 记录当前级信息
-            stage_info = {
-                'stage': stage_number,
-                'x_liquid': current_x,
-                'y_vapor_actual': current_y_actual,
-                'y_vapor_equilibrium': current_y_equilibrium,
-                'temperature': float(self.vle.get_temperature_by_x(current_x)),
-                'relative_volatility': float(self.vle.get_alpha_by_x(current_x)),
-                'efficiency': E_mv if stage_number > 1 else 1.0,  # 塔釜效率为1
-                'section': self._get_section(current_x)
-            }
-            stages.append(stage_info)
-            
-            # 打印当前级信息
-            print(f"第{stage_number:2d}级: x = {current_x:.4f}, y_实际 = {current_y_actual:.4f}, "
-                  f"y_平衡 = {current_y_equilibrium:.4f}, 段别 = {stage_info['section']}")
-            
-            # 计算下一级的液相组成
+        reached = n > 0 and y_actual[-1] >= self.x_D
+        if verbose:
+            # 计算过程先缓存为行列表，结束后一次性输出
+            lines = [
+                "从塔釜开始塔板迭代计算 (考虑气相Murphree效率)...",
+                f"目标馏出液组成 x_D = {self.x_D}",
+                f"气相Murphree效率 E_mv = {E_mv}",
+            ]
             if self.total_reflux:
-                # 全回流操作线: x = y
-                next_x = current_y_actual
-            else:
-                # ---------- <<< 修改开始 >>> ----------
-                # 使用正确的切换点 x_intersect
-                if current_x <= self.x_intersect:
-                # ---------- <<< 修改结束 >>> ----------
-                    # 提馏段操作线
-                    next_x = (self.V_prime * current_y_actual + self.W * self.x_W) / self.L_prime
-                else:
-                    # 精馏段操作线
-                    next_x = (self.V * current_y_actual - self.D * self.x_D) / self.L
-            
-            # 通过平衡关系由x求平衡气相组成 y*
-            y_equilibrium_next = float(self.vle.get_y_by_x(next_x))
-            
-            # 使用气相Murphree效率计算实际气相组成
-            # 对于从下往上的计算: y_n = y_{n-1} + E_mv * (y*_n - y_{n-1})
-            y_actual_next = current_y_actual + E_mv * (y_equilibrium_next - current_y_actual)
-            
-            # 更新为上一级的值
-            current_x = next_x
-            current_y_actual = y_actual_next
-            current_y_equilibrium = y_equilibrium_next
-            stage_number += 1
-            
-            # 安全保护，避免无限循环
-            if stage_number > 150:  # 增加安全保护次数
-                print("警告: 迭代次数超过150次，强制停止")
-                break
-        
-        # 记录最后一级
-        if stages and current_y_actual >= self.x_D:
-            final_stage = {
-                'stage': stage_number,
-                'x_liquid': current_x,
-                'y_vapor_actual': current_y_actual,
-                'y_vapor_equilibrium': current_y_equilibrium,
-                'temperature': float(self.vle.get_temperature_by_x(current_x)),
-                'relative_volatility': float(self.vle.get_alpha_by_x(current_x)),
-                'efficiency': E_mv,
-                'section': self._get_section(current_x)
-            }
-            stages.append(final_stage)
-            print(f"第{stage_number:2d}级: x = {current_x:.4f}, y_实际 = {current_y_actual:.4f}, "
-                  f"y_平衡 = {current_y_equilibrium:.4f}, 段别 = {final_stage['section']}")
-            print(f"达到目标馏出液组成 x_D = {self.x_D}")
+                lines.append("操作模式: 全回流")
+            lines.append("-" * 80)
+            for i in range(n):
+                if reached and i == n - 1 and capped:
+                    lines.append("警告: 迭代次数超过150次，强制停止")
+                lines.append(f"第{i + 1:2d}级: x = {x_liquid[i]:.4f}, y_实际 = {y_actual[i]:.4f}, "
+                             f"y_平衡 = {y_equilibrium[i]:.4f}, 段别 = {section[i]}")
+            if capped and not reached:
+                lines.append("警告: 迭代次数超过150次，强制停止")
+            if reached:
+                lines.append(f"达到目标馏出液组成 x_D = {self.x_D}")
+            print("\n".join(lines))
+        elif capped:
+            print("警告: 迭代次数超过150次，强制停止")
         
-        return pd.DataFrame(stages)
+        return pd.DataFrame({
+            'stage': np.arange(1, n + 1, dtype=np.int16),
+            'x_liquid': x_liquid,
+            'y_vapor_actual': y_actual,
+            'y_vapor_equilibrium': y_equilibrium,
+            'temperature': temperature,
+            'relative_volatility': alpha,
+            'efficiency': efficiency,
+            'section': section
+        })
 
-    def _get_section(self, x: float) -> str:
-        """根据液相组成判断塔段"""
+    def _get_sections(self, x_liquid) -> pd.Categorical:
+        """根据各级液相组成批量判断塔段，返回分类数组"""
         if self.total_reflux:
-            return "全回流段"
-        # ---------- <<< 修改开始 >>> ----------
-        elif x > self.x_intersect:
-            return "精馏段"
+            codes = np.full(len(x_liquid), 2, dtype=np.int8)
         else:
-            return "提馏段"
-        # ---------- <<< 修改结束 >>> ----------
+            codes = np.where(x_liquid > self.x_intersect, 0, 1).astype(np.int8)
+        return pd.Categorical.from_codes(codes, categories=_SECTION_CATEGORIES)
 
-    def _calculate_decimal_stages(self, stages_df, calculation_direction: str) -> float:
+    def _calculate_decimal_stages(self, profile: np.ndarray, calculation_direction: str, verbose: bool = False) -> float:
         """
         计算小数形式的理论级数，用于全塔板效率计算。
         
-        :param stages_df: 塔板数据DataFrame
+        :param profile: 各级组成数组 (从塔顶计算时为液相组成 x，从塔釜计算时为实际气相组成 y)
         :param calculation_direction: 计算方向 'top' 或 'bottom'
+        :param verbose: 是否打印插值过程
         :return: 小数形式的理论级数
         """
-        if len(stages_df) < 2:
-            return len(stages_df)
+        if profile.size < 2:
+            return profile.size
         
         if calculation_direction == 'top':
             # 从塔顶计算：寻找跨越目标组成x_W的两个塔板
-            for i in range(len(stages_df) - 1):
-                x_current = stages_df.iloc[i]['x_liquid']
-                x_next = stages_df.iloc[i + 1]['x_liquid']
-                
-                if x_current >= self.x_W >= x_next:
-                    # 线性插值计算小数部分
-                    fraction = (x_current - self.x_W) / (x_current - x_next)
-                    decimal_stages = i + fraction
-                    print(f"小数理论级数计算: 第{i}级x={x_current:.4f}, 第{i+1}级x={x_next:.4f}")
-                    print(f"在x_W={self.x_W}处插值, 小数部分 = {fraction:.3f}")
-                    print(f"总小数理论级数 = {decimal_stages:.3f}")
-                    return decimal_stages
+            # 液相组成自塔顶向下单调递减：翻转为升序后二分查找，i 为最后一个 x > x_W 的塔板
+            x = profile
+            i = x.size - int(np.searchsorted(x[::-1], self.x_W, side='right')) - 1
+            if 0 <= i < x.size - 1 and x[i] >= self.x_W >= x[i + 1]:
+                x_current, x_next = x[i], x[i + 1]
+                # 线性插值计算小数部分
+                fraction = (x_current - self.x_W) / (x_current - x_next)
+                decimal_stages = i + fraction
+                if verbose:
+                    print(f"小数理论级数计算: 第{i}级x={x_current:.4f}, 第{i+1}级x={x_next:.4f}\n"
+                          f"在x_W={self.x_W}处插值, 小数部分 = {fraction:.3f}\n"
+                          f"总小数理论级数 = {decimal_stages:.3f}")
+                return decimal_stages
         
         else:  # bottom
             # 从塔釜计算：寻找跨越目标组成x_D的两个塔板
-            for i in range(len(stages_df) - 1):
-                y_current = stages_df.iloc[i]['y_vapor_actual']
-                y_next = stages_df.iloc[i + 1]['y_vapor_actual']
-                
-                if y_current <= self.x_D <= y_next:
-                    # 线性插值计算小数部分
-                    fraction = (self.x_D - y_current) / (y_next - y_current)
-                    decimal_stages = i + fraction
-                    print(f"小数理论级数计算: 第{i}级y={y_current:.4f}, 第{i+1}级y={y_next:.4f}")
-                    print(f"在x_D={self.x_D}处插值, 小数部分 = {fraction:.3f}")
-                    print(f"总小数理论级数 = {decimal_stages:.3f}")
-                    return decimal_stages
+            # 气相组成自塔釜向上单调递增：二分查找，i 为最后一个 y < x_D 的塔板
+            y = profile
+            i = int(np.searchsorted(y, self.x_D, side='left')) - 1
+            if 0 <= i < y.size - 1 and y[i] <= self.x_D <= y[i + 1]:
+                y_current, y_next = y[i], y[i + 1]
+                # 线性插值计算小数部分
+                fraction = (self.x_D - y_current) / (y_next - y_current)
+                decimal_stages = i + fraction
+                if verbose:
+                    print(f"小数理论级数计算: 第{i}级y={y_current:.4f}, 第{i+1}级y={y_next:.4f}\n"
+                          f"在x_D={self.x_D}处插值, 小数部分 = {fraction:.3f}\n"
+                          f"总小数理论级数 = {decimal_stages:.3f}")
+                return decimal_stages
         
         # 如果没有找到跨越点，返回整数级数
         print("警告: 无法计算小数理论级数，返回整数级数")
-        return len(stages_df)
+        return profile.size
 
     def print_summary(self, stages_df, calculation_direction: str = 'top', decimal_stages: float | None = None):
         """
@@ -348,58 +579,60 @@ class McCabeThiele:
         :param calculation_direction: 计算方向 'top' 或 'bottom'
         :param decimal_stages: 小数形式的理论级数（可选）
         """
+        # 整张表先缓存为行列表，最后一次性写出；数据行使用 % 格式化，比逐行 f-string + print 快
         if calculation_direction == 'top':
-            print("\n" + "="*90)
+            lines = ["", "="*90]
             if self.total_reflux:
-                print("全回流精馏塔理论塔板计算汇总 (从塔顶开始)")
+                lines.append("全回流精馏塔理论塔板计算汇总 (从塔顶开始)")
             else:
-                print("精馏塔理论塔板计算汇总 (从塔顶开始，考虑液相Murphree效率)")
-            print("="*90)
-            print(f"{'塔板级数':<10} {'液相组成(x)':<12} {'气相组成(y)':<12} {'温度(℃)':<10} {'效率':<8} {'段别':<10}")
-            print("-"*90)
+                lines.append("精馏塔理论塔板计算汇总 (从塔顶开始，考虑液相Murphree效率)")
+            lines.append("="*90)
+            lines.append(f"{'塔板级数':<10} {'液相组成(x)':<12} {'气相组成(y)':<12} {'温度(℃)':<10} {'效率':<8} {'段别':<10}")
+            lines.append("-"*90)
             
-            for _, stage in stages_df.iterrows():
-                print(f"{stage['stage']:<10} {stage['x_liquid']:<12.4f} {stage['y_vapor']:<12.4f} "
-                      f"{stage['temperature']:<10.1f} {stage['efficiency']:<8.2f} {stage['section']:<10}")
+            columns = ['stage', 'x_liquid', 'y_vapor', 'temperature', 'efficiency', 'section']
+            row_format = "%-10d %-12.4f %-12.4f %-10.1f %-8.2f %-10s"
         
         else:  # bottom
-            print("\n" + "="*100)
+            lines = ["", "="*100]
             if self.total_reflux:
-                print("全回流精馏塔理论塔板计算汇总 (从塔釜开始)")
+                lines.append("全回流精馏塔理论塔板计算汇总 (从塔釜开始)")
             else:
-                print("精馏塔理论塔板计算汇总 (从塔釜开始，考虑气相Murphree效率)")
-            print("="*100)
-            print(f"{'塔板级数':<10} {'液相组成(x)':<12} {'实际气相(y)':<12} {'平衡气相(y*)':<12} {'温度(℃)':<10} {'效率':<8} {'段别':<10}")
-            print("-"*100)
+                lines.append("精馏塔理论塔板计算汇总 (从塔釜开始，考虑气相Murphree效率)")
+            lines.append("="*100)
+            lines.append(f"{'塔板级数':<10} {'液相组成(x)':<12} {'实际气相(y)':<12} {'平衡气相(y*)':<12} {'温度(℃)':<10} {'效率':<8} {'段别':<10}")
+            lines.append("-"*100)
             
-            for _, stage in stages_df.iterrows():
-                print(f"{stage['stage']:<10} {stage['x_liquid']:<12.4f} {stage['y_vapor_actual']:<12.4f} "
-                      f"{stage['y_vapor_equilibrium']:<12.4f} {stage['temperature']:<10.1f} {stage['efficiency']:<8.2f} {stage['section']:<10}")
+            columns = ['stage', 'x_liquid', 'y_vapor_actual', 'y_vapor_equilibrium', 'temperature', 'efficiency', 'section']
+            row_format = "%-10d %-12.4f %-12.4f %-12.4f %-10.1f %-8.2f %-10s"
         
-        print("-" * (100 if calculation_direction == 'bottom' else 90))
+        lines.extend(row_format % row for row in stages_df[columns].itertuples(index=False, name=None))
+        lines.append("-" * (100 if calculation_direction == 'bottom' else 90))
         
         # 输出理论级数信息
         integer_stages = len(stages_df)
-        print(f"整数理论塔板数: {integer_stages} 级")
+        lines.append(f"整数理论塔板数: {integer_stages} 级")
         
         if decimal_stages is not None:
-            print(f"小数理论塔板数: {decimal_stages:.3f} 级")
-            print(f"全塔板效率计算用理论级数: {decimal_stages:.3f}")
+            lines.append(f"小数理论塔板数: {decimal_stages:.3f} 级")
+            lines.append(f"全塔板效率计算用理论级数: {decimal_stages:.3f}")
         
         if not self.total_reflux:
-            # 常规操作时显示段别分布
+            # 常规操作时显示段别分布 (一次统计各段级数)
+            section_counts = stages_df['section'].value_counts()
+            rectifying_stages = section_counts.get('精馏段', 0)
+            stripping_stages = section_counts.get('提馏段', 0)
             if calculation_direction == 'top':
-                rectifying_stages = len(stages_df[stages_df['section'] == '精馏段'])
-                stripping_stages = len(stages_df[stages_df['section'] == '提馏段'])
-                print(f"其中精馏段: {rectifying_stages} 级")
-                print(f"其中提馏段: {stripping_stages} 级")
-                print(f"进料板位置: 第{rectifying_stages + 1}级")
+                lines.append(f"其中精馏段: {rectifying_stages} 级")
+                lines.append(f"其中提馏段: {stripping_stages} 级")
+                lines.append(f"进料板位置: 第{rectifying_stages + 1}级")
             else:
-                stripping_stages = len(stages_df[stages_df['section'] == '提馏段'])
-                rectifying_stages = len(stages_df[stages_df['section'] == '精馏段'])
-                print(f"其中提馏段: {stripping_stages} 级")
-                print(f"其中精馏段: {rectifying_stages} 级")
-                print(f"进料板位置: 第{stripping_stages}级")
+                lines.append(f"其中提馏段: {stripping_stages} 级")
+                lines.append(f"其中精馏段: {rectifying_stages} 级")
+                lines.append(f"进料板位置: 第{stripping_stages}级")
+        
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
 
 # 使用示例
 if __name__ == "__main__":
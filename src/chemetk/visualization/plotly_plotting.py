@@ -5,29 +5,31 @@ from typing import Optional
 
 # 假设 McCabeThiele 类在其他模块中定义
 from ..unit_ops.distillation import McCabeThiele
+from ._curves import _stage_path, _vle_curves
 
-def create_distillation_plot_plotly(mt_instance: McCabeThiele, plot_stages: bool = True, title: Optional[str] = None):
+def _mccabe_thiele_traces(mt_instance: McCabeThiele, plot_stages: bool = True):
     """
-    使用 Plotly 创建精馏塔的 McCabe-Thiele 图。
-
-    参数:
-    - mt_instance: McCabeThiele 类的实例。
-    - plot_stages (bool): 是否绘制理论塔板的梯级图。
-    - title (Optional[str]): 图表标题。
+    构造 McCabe-Thiele 图的全部曲线，按是否随操作条件变化分为两组。
 
     返回:
-    - go.Figure: 一个 Plotly Figure 对象。
+    - tuple: (static, dynamic)。static 为只取决于 VLE 的平衡线和对角线；
+      dynamic 为随 q、R 等参数变化的操作线、塔板阶梯和标记点。
+      Web 界面拖动滑块时只替换 dynamic 部分。
     """
-    fig = go.Figure()
     vle = mt_instance.vle
     x_D, x_W, x_F, q = mt_instance.x_D, mt_instance.x_W, mt_instance.x_F, mt_instance.q
 
+    # 先收集全部曲线，最后一次性构造 Figure：
+    # 逐条 add_trace 每次都会重新校验并复制已有的 data，Dash 回调每次重绘都要付出这部分开销
+    static = []
+    dynamic = []
+
     # 1. 准备平衡线数据
-    x_eq = np.linspace(0.0, 1.0, 200)
-    y_eq = vle.get_y_by_x(x_eq)
+    # 平衡曲线采样结果按 VLE 实例缓存，Dash 回调每次重绘时直接复用
+    x_eq, y_eq, _, _ = _vle_curves(vle)
     
     # 绘制平衡线
-    fig.add_trace(go.Scatter(
+    static.append(go.Scatter(
         x=x_eq, 
         y=y_eq,
         mode='lines',
@@ -36,7 +38,7 @@ def create_distillation_plot_plotly(mt_instance: McCabeThiele, plot_stages: bool
     ))
 
     # 绘制对角线 (y=x)
-    fig.add_trace(go.Scatter(
+    static.append(go.Scatter(
         x=[0, 1], 
         y=[0, 1],
         mode='lines',
@@ -45,56 +47,26 @@ def create_distillation_plot_plotly(mt_instance: McCabeThiele, plot_stages: bool
     ))
 
     # 2. 准备并绘制操作线
-    # 计算三条线的交点
-    if q == 1:
-        x_int = x_F
-        y_int = mt_instance.L_over_V * x_int + mt_instance.D_xD_over_V
-    elif q == 0:
-        y_int = x_F
-        x_int = (y_int - mt_instance.D_xD_over_V) / mt_instance.L_over_V
-    else:
-        x_int = (mt_instance.D_xD_over_V + x_F/(q-1)) / (q/(q-1) - mt_instance.L_over_V)
-        y_int = mt_instance.L_over_V * x_int + mt_instance.D_xD_over_V
+    # 三条线的交点已在 McCabeThiele 初始化时计算
+    x_int, y_int = mt_instance.intersection_point
     
     # 精馏段操作线
-    fig.add_trace(go.Scatter(x=[x_D, x_int], y=[x_D, y_int], mode='lines', name='精馏段操作线', line=dict(color='blue')))
+    dynamic.append(go.Scatter(x=[x_D, x_int], y=[x_D, y_int], mode='lines', name='精馏段操作线', line=dict(color='blue')))
     # 提馏段操作线
-    fig.add_trace(go.Scatter(x=[x_W, x_int], y=[x_W, y_int], mode='lines', name='提馏段操作线', line=dict(color='red')))
+    dynamic.append(go.Scatter(x=[x_W, x_int], y=[x_W, y_int], mode='lines', name='提馏段操作线', line=dict(color='red')))
     # q线
-    fig.add_trace(go.Scatter(x=[x_F, x_int], y=[x_F, y_int], mode='lines', name='q线', line=dict(color='purple', dash='dash')))
+    dynamic.append(go.Scatter(x=[x_F, x_int], y=[x_F, y_int], mode='lines', name='q线', line=dict(color='purple', dash='dash')))
 
     # 3. 准备并绘制理论塔板阶梯 (重构版本)
     if plot_stages:
-        stages_df = mt_instance.calculate_stages(start_from="top")
-        stage_x = []
-        stage_y = []
-
-        # 假设 stages_df 包含操作线上的点
-        if not stages_df.empty:
-            # 添加第一个点，作为路径的起点
-            stage_x.append(stages_df['x_liquid'].iloc[0])
-            stage_y.append(stages_df['y_vapor'].iloc[0])
-
-            for i in range(len(stages_df) - 1):
-                x_start = stages_df['x_liquid'].iloc[i]
-                y_start = stages_df['y_vapor'].iloc[i]
-                x_end = stages_df['x_liquid'].iloc[i+1]
-                y_end = stages_df['y_vapor'].iloc[i+1]
-
-                # 路径: (x_start, y_start) -> (x_start, y_end) -> (x_end, y_end)
-                # 顶点1: 垂直移动后的点
-                stage_x.append(x_start)
-                stage_y.append(y_end)
-                
-                # 顶点2: 水平移动后的点 (即下一个操作线上的点)
-                stage_x.append(x_end)
-                stage_y.append(y_end)
+        # 只需要各级组成：直接取 NumPy 数组结果，不构造 DataFrame；
+        # 阶梯路径与 Matplotlib 版本共用同一个向量化构造
+        stages = mt_instance.calculate_stage_arrays()
+        x_arr = stages['x_liquid']
+        y_arr = stages['y_vapor']
+        stage_x, stage_y = _stage_path(x_arr, y_arr)
 
-            # 添加最后一个点，作为路径的终点
-            stage_x.append(stages_df['x_liquid'].iloc[-1])
-            stage_y.append(stages_df['x_liquid'].iloc[-1])
-
-        fig.add_trace(go.Scatter(
+        dynamic.append(go.Scatter(
             x=stage_x, 
             y=stage_y,
             mode='lines',
@@ -103,28 +75,32 @@ def create_distillation_plot_plotly(mt_instance: McCabeThiele, plot_stages: bool
         ))
         
         # 添加塔板编号，放在每个水平线的末端（即平衡线上的点）
-        stage_numbers_x = stages_df['x_liquid'].iloc[:-1]
-        stage_numbers_y = stages_df['y_vapor'].iloc[1:]
-        fig.add_trace(go.Scatter(
+        stage_numbers_x = x_arr[:-1]
+        stage_numbers_y = y_arr[1:]
+        dynamic.append(go.Scatter(
             x=stage_numbers_x,
             y=stage_numbers_y,
             mode='text',
-            text=[f" {s}" for s in stages_df['stage'].iloc[1:]],
+            text=[f" {s}" for s in stages['stage'][1:].tolist()],
             textposition='middle right',
             showlegend=False
         ))
 
     # 4. 标记重要点
-    fig.add_trace(go.Scatter(x=[x_D], y=[x_D], mode='markers', name=f'x_D={x_D:.3f}', marker=dict(color='blue', size=8)))
-    fig.add_trace(go.Scatter(x=[x_W], y=[x_W], mode='markers', name=f'x_W={x_W:.3f}', marker=dict(color='red', size=8)))
-    fig.add_trace(go.Scatter(x=[x_F], y=[x_F], mode='markers', name=f'x_F={x_F:.3f}', marker=dict(color='purple', size=8)))
+    dynamic.append(go.Scatter(x=[x_D], y=[x_D], mode='markers', name=f'x_D={x_D:.3f}', marker=dict(color='blue', size=8)))
+    dynamic.append(go.Scatter(x=[x_W], y=[x_W], mode='markers', name=f'x_W={x_W:.3f}', marker=dict(color='red', size=8)))
+    dynamic.append(go.Scatter(x=[x_F], y=[x_F], mode='markers', name=f'x_F={x_F:.3f}', marker=dict(color='purple', size=8)))
+
+    return static, dynamic
 
-    # 5. 更新图表布局
+def _mccabe_thiele_layout(mt_instance: McCabeThiele, title: Optional[str] = None):
+    """构造 McCabe-Thiele 图的布局 (坐标轴、标题、尺寸)"""
+    vle = mt_instance.vle
     if title is None:
         title = f'McCabe-Thiele Diagram for {vle.name}'
     
     comp_a = vle.components[0]
-    fig.update_layout(
+    layout = dict(
         title=title,
         xaxis_title=f"液相摩尔分数 ({comp_a}) (x)",
         yaxis_title=f"气相摩尔分数 ({comp_a}) (y)",
@@ -136,5 +112,19 @@ def create_distillation_plot_plotly(mt_instance: McCabeThiele, plot_stages: bool
         yaxis_scaleanchor="x",
         yaxis_scaleratio=1
     )
-    
-    return fig
\ No newline at end of file
+    return layout
+
+def create_distillation_plot_plotly(mt_instance: McCabeThiele, plot_stages: bool = True, title: Optional[str] = None):
+    """
+    使用 Plotly 创建精馏塔的 McCabe-Thiele 图。
+
+    参数:
+    - mt_instance: McCabeThiele 类的实例。
+    - plot_stages (bool): 是否绘制理论塔板的梯级图。
+    - title (Optional[str]): 图表标题。
+
+    返回:
+    - go.Figure: 一个 Plotly Figure 对象。
+    """
+    static, dynamic = _mccabe_thiele_traces(mt_instance, plot_stages)
+    return go.Figure(data=static + dynamic, layout=_mccabe_thiele_layout(mt_instance, title))
@@ -1,95 +1,127 @@
 # chemetk/visualization/plotting.py
 
-import matplotlib.pyplot as plt
+import os
 import numpy as np
-from typing import Optional
+import pandas as pd
+from typing import Optional, TYPE_CHECKING
+
+# matplotlib.pyplot 在各绘图函数内按需导入：首次导入需要构建字体缓存，
+# 只使用 Plotly/Web 界面的用户不必承担这部分启动开销
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+# 无界面环境 (如 Dash 服务端) 设置 CHEMETK_HEADLESS 后直接使用 Agg 后端，
+# 跳过 pyplot 首次导入时对 Tk/GTK 等交互式后端的探测
+if os.environ.get('CHEMETK_HEADLESS'):
+    import matplotlib
+    matplotlib.use('Agg')
+
+# 新建图形时使用固定的边距，代替每次显示前调用 tight_layout 的约束求解
+_SUBPLOT_MARGINS = dict(left=0.1, right=0.95, top=0.92, bottom=0.1)
 
 from ..unit_ops.distillation import McCabeThiele
+from ._curves import _stage_path, _vle_curves
 
-def plot_vle_txy(vle, title: Optional[str] = None, show: bool = True):
+def plot_vle_txy(vle, title: Optional[str] = None, show: bool = True, ax: Optional["plt.Axes"] = None):
     """
     绘制二元体系的温度-组成图 (T-x-y diagram)。
 
     :param vle: VLE 类的实例，包含汽液平衡数据和插值方法。
     :param title: 图表标题。如果为 None，则使用 VLE 数据中的名称。
     :param show: 是否立即显示图像。
+    :param ax: 绘制到已有的坐标轴上；为 None 时新建图形。
+    :return: (fig, ax) Matplotlib 图形和坐标轴对象
     """
+    import matplotlib.pyplot as plt
+
     # 生成平滑的曲线数据
-    x_continuous = np.linspace(0.0, 1.0, 200)
-    y_continuous = vle.get_y_by_x(x_continuous)
-    temp_continuous_x = vle.get_temperature_by_x(x_continuous)
-    temp_continuous_y = vle.get_temperature_by_y(y_continuous)
+    x_continuous, y_continuous, temp_continuous_x, temp_continuous_y = _vle_curves(vle)
 
-    plt.figure(figsize=(10, 7))
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 7))
+        fig.subplots_adjust(**_SUBPLOT_MARGINS)
+    else:
+        fig = ax.figure
     
     # 绘制泡点线 (T-x)
-    plt.plot(x_continuous, temp_continuous_x, 'b-', linewidth=2, label='Bubble point line (T-x)')
+    ax.plot(x_continuous, temp_continuous_x, 'b-', linewidth=2, label='Bubble point line (T-x)')
     # 绘制露点线 (T-y)
-    plt.plot(y_continuous, temp_continuous_y, 'r-', linewidth=2, label='Dew point line (T-y)')
+    ax.plot(y_continuous, temp_continuous_y, 'r-', linewidth=2, label='Dew point line (T-y)')
     
     # 绘制原始数据点
-    plt.plot(vle.x_values, vle.temps, 'bo', label='Bubble point data')
-    plt.plot(vle.y_values, vle.temps, 'ro', label='Dew point data')
+    ax.plot(vle.x_values, vle.temps, 'bo', label='Bubble point data')
+    ax.plot(vle.y_values, vle.temps, 'ro', label='Dew point data')
 
     # 设置图表标题和标签
     if title is None:
         title = f'{vle.name} T-x-y Diagram (101.3kPa)'
     
     comp_a = vle.components[0]
-    plt.title(title, fontsize=14, fontweight='bold')
-    plt.xlabel(f'Mole Fraction of {comp_a} (x, y)', fontsize=12)
-    plt.ylabel('Temperature (°C)', fontsize=12)
-    plt.xlim(0.0, 1.0)
-    plt.legend(loc='best', fontsize=10)
-    plt.grid(True, linestyle='--', alpha=0.6)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel(f'Mole Fraction of {comp_a} (x, y)', fontsize=12)
+    ax.set_ylabel('Temperature (°C)', fontsize=12)
+    ax.set_xlim(0.0, 1.0)
+    ax.legend(loc='best', fontsize=10)
+    ax.grid(True, linestyle='--', alpha=0.6)
     
     if show:
-        plt.tight_layout()
         plt.show()
+    
+    return fig, ax
 
-def plot_vle_yx(vle, title: Optional[str] = None, show: bool = True):
+def plot_vle_yx(vle, title: Optional[str] = None, show: bool = True, ax: Optional["plt.Axes"] = None):
     """
     绘制二元体系的汽液平衡图 (y-x diagram)。
 
     :param vle: VLE 类的实例。
     :param title: 图表标题。如果为 None，则使用 VLE 数据中的名称。
     :param show: 是否立即显示图像。
+    :param ax: 绘制到已有的坐标轴上；为 None 时新建图形。
+    :return: (fig, ax) Matplotlib 图形和坐标轴对象
     """
-    x_continuous = np.linspace(0.0, 1.0, 200)
-    y_continuous = vle.get_y_by_x(x_continuous)
+    import matplotlib.pyplot as plt
+
+    x_continuous, y_continuous, _, _ = _vle_curves(vle)
 
-    plt.figure(figsize=(8, 8))
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(8, 8))
+        fig.subplots_adjust(**_SUBPLOT_MARGINS)
+    else:
+        fig = ax.figure
     
     # 绘制平衡线 (y-x)
-    plt.plot(x_continuous, y_continuous, 'g-', linewidth=2, label='Equilibrium line (y-x)')
+    ax.plot(x_continuous, y_continuous, 'g-', linewidth=2, label='Equilibrium line (y-x)')
     # 绘制对角线 (y=x)
-    plt.plot([0.0, 1.0], [0.0, 1.0], 'k--', linewidth=1.5, label='Diagonal line (y=x)')
+    ax.plot([0.0, 1.0], [0.0, 1.0], 'k--', linewidth=1.5, label='Diagonal line (y=x)')
     
     # 绘制原始数据点
-    plt.plot(vle.x_values, vle.y_values, 'go', label='Equilibrium data')
+    ax.plot(vle.x_values, vle.y_values, 'go', label='Equilibrium data')
 
     # 设置图表标题和标签
     if title is None:
         title = f'{vle.name} y-x Diagram (101.3kPa)'
         
     comp_a = vle.components[0]
-    plt.title(title, fontsize=14, fontweight='bold')
-    plt.xlabel(f'Liquid Mole Fraction of {comp_a} (x)', fontsize=12)
-    plt.ylabel(f'Vapor Mole Fraction of {comp_a} (y)', fontsize=12)
-    plt.xlim(0.0, 1.0)
-    plt.ylim(0.0, 1.0)
-    plt.legend(loc='best', fontsize=10)
-    plt.grid(True, linestyle='--', alpha=0.5)
-    plt.gca().set_aspect('equal', adjustable='box')
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel(f'Liquid Mole Fraction of {comp_a} (x)', fontsize=12)
+    ax.set_ylabel(f'Vapor Mole Fraction of {comp_a} (y)', fontsize=12)
+    ax.set_xlim(0.0, 1.0)
+    ax.set_ylim(0.0, 1.0)
+    ax.legend(loc='best', fontsize=10)
+    ax.grid(True, linestyle='--', alpha=0.5)
+    ax.set_aspect('equal', adjustable='box')
     
     if show:
-        plt.tight_layout()
         plt.show()
+    
+    return fig, ax
 
 from ..unit_ops.distillation import McCabeThiele
 
 def plot_mccabe_thiele(mt_instance: McCabeThiele, plot_stages: bool = True, 
-                                      title: Optional[str] = None, show: bool = True):
+                                      title: Optional[str] = None, show: bool = True,
+                                      stages_df: Optional[pd.DataFrame] = None,
+                                      ax: Optional["plt.Axes"] = None):
     """
     使用 Matplotlib 创建精馏塔的 McCabe-Thiele 图。
 
@@ -98,18 +130,25 @@ def plot_mccabe_thiele(mt_instance: McCabeThiele, plot_stages: bool = True,
     - plot_stages (bool): 是否绘制理论塔板的梯级图
     - title (Optional[str]): 图表标题
     - show (bool): 是否立即显示图表
+    - stages_df (Optional[pd.DataFrame]): 已有的从塔顶计算的塔板结果；为 None 时自动计算
+    - ax (Optional[plt.Axes]): 绘制到已有的坐标轴上；为 None 时新建图形
 
     返回:
     - tuple: (fig, ax) Matplotlib 图形和坐标轴对象
     """
-    # 创建图形和坐标轴
-    fig, ax = plt.subplots(figsize=(10, 10))
+    import matplotlib.pyplot as plt
+
+    # 创建图形和坐标轴 (传入 ax 时复用已有图形)
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 10))
+        fig.subplots_adjust(**_SUBPLOT_MARGINS)
+    else:
+        fig = ax.figure
     vle = mt_instance.vle
     x_D, x_W, x_F, q = mt_instance.x_D, mt_instance.x_W, mt_instance.x_F, mt_instance.q
 
     # 1. 准备平衡线数据
-    x_eq = np.linspace(0.0, 1.0, 200)
-    y_eq = vle.get_y_by_x(x_eq)
+    x_eq, y_eq, _, _ = _vle_curves(vle)
     
     # 绘制平衡线
     ax.plot(x_eq, y_eq, 'b-', label='Equilibrium Line', linewidth=2)
@@ -118,16 +157,8 @@ def plot_mccabe_thiele(mt_instance: McCabeThiele, plot_stages: bool = True,
     ax.plot([0, 1], [0, 1], '--', color='grey', label='y=x', linewidth=1.5)
 
     # 2. 准备并绘制操作线
-    # 计算三条线的交点
-    if q == 1:
-        x_int = x_F
-        y_int = mt_instance.L_over_V * x_int + mt_instance.D_xD_over_V
-    elif q == 0:
-        y_int = x_F
-        x_int = (y_int - mt_instance.D_xD_over_V) / mt_instance.L_over_V
-    else:
-        x_int = (mt_instance.D_xD_over_V + x_F/(q-1)) / (q/(q-1) - mt_instance.L_over_V)
-        y_int = mt_instance.L_over_V * x_int + mt_instance.D_xD_over_V
+    # 三条线的交点已在 McCabeThiele 初始化时计算
+    x_int, y_int = mt_instance.intersection_point
     
     # 精馏段操作线
     ax.plot([x_D, x_int], [x_D, y_int], 'b-', label='Rectifying Section', linewidth=2)
@@ -138,44 +169,29 @@ def plot_mccabe_thiele(mt_instance: McCabeThiele, plot_stages: bool = True,
 
     # 3. 准备并绘制理论塔板阶梯
     if plot_stages:
-        stages_df = mt_instance.calculate_stages(start_from="top")
-        stage_x = []
-        stage_y = []
-
-        # 假设 stages_df 包含操作线上的点
-        if not stages_df.empty:
-            # 添加第一个点，作为路径的起点
-            stage_x.append(stages_df['x_liquid'].iloc[0])
-            stage_y.append(stages_df['y_vapor'].iloc[0])
-
-            for i in range(len(stages_df) - 1):
-                x_start = stages_df['x_liquid'].iloc[i]
-                y_start = stages_df['y_vapor'].iloc[i]
-                x_end = stages_df['x_liquid'].iloc[i+1]
-                y_end = stages_df['y_vapor'].iloc[i+1]
-
-                # 路径: (x_start, y_start) -> (x_start, y_end) -> (x_end, y_end)
-                # 顶点1: 垂直移动后的点
-                stage_x.append(x_start)
-                stage_y.append(y_end)
-                
-                # 顶点2: 水平移动后的点 (即下一个操作线上的点)
-                stage_x.append(x_end)
-                stage_y.append(y_end)
-
-            # 添加最后一个点，作为路径的终点
-            stage_x.append(stages_df['x_liquid'].iloc[-1])
-            stage_y.append(stages_df['x_liquid'].iloc[-1])
+        # 各列只转换一次为 NumPy 数组，后续阶梯和编号均在数组上操作；
+        # 未传入 stages_df 时直接取逐级计算的数组结果，不构造 DataFrame
+        if stages_df is None:
+            stages = mt_instance.calculate_stage_arrays()
+            x_arr = stages['x_liquid']
+            y_arr = stages['y_vapor']
+        else:
+            x_arr = stages_df['x_liquid'].to_numpy()
+            y_arr = stages_df['y_vapor'].to_numpy()
+        stage_x, stage_y = _stage_path(x_arr, y_arr)
 
         # 绘制阶梯线
         ax.plot(stage_x, stage_y, 'g-', label='Theoretical Stages', linewidth=1.5, alpha=0.7)
         
         # 添加塔板编号
-        stage_numbers_x = stages_df['x_liquid'].iloc[:-1]
-        stage_numbers_y = stages_df['y_vapor'].iloc[1:]
-        for i, (x, y) in enumerate(zip(stage_numbers_x, stage_numbers_y)):
-            ax.text(x, y, f" {i+1}", fontsize=8, verticalalignment='center',
-                   horizontalalignment='left', color='darkgreen')
+        # 转为 Python 浮点列表并预先绑定 ax.text 和公共样式，循环内只剩创建文本对象本身
+        stage_numbers_x = x_arr[:-1].tolist()
+        stage_numbers_y = y_arr[1:].tolist()
+        text = ax.text
+        text_style = dict(fontsize=8, verticalalignment='center',
+                          horizontalalignment='left', color='darkgreen')
+        for i, (x, y) in enumerate(zip(stage_numbers_x, stage_numbers_y), start=1):
+            text(x, y, f" {i}", **text_style)
 
     # 4. 标记重要点
     ax.plot(x_D, x_D, 'bo', markersize=8, label=f'x_D={x_D:.3f}')
@@ -208,14 +224,13 @@ def plot_mccabe_thiele(mt_instance: McCabeThiele, plot_stages: bool = True,
 
     # 如果要求显示，则显示图表
     if show:
-        plt.tight_layout()
         plt.show()
     
     return fig, ax
 
     
 
-def plot_fugacity_results(pressures, fugacities, chemical_potentials, fluid_name, temp_k):
+def plot_fugacity_results(pressures, fugacities, chemical_potentials, fluid_name, temp_k, axes=None):
     """
     绘制逸度和化学势随压力变化的图表。
 
@@ -225,8 +240,15 @@ def plot_fugacity_results(pressures, fugacities, chemical_potentials, fluid_name
         chemical_potentials (array-like): 化学势数据 (单位: kJ/mol).
         fluid_name (str): 流体名称.
         temp_k (float): 温度 (单位: K).
+        axes (tuple, optional): 绘制到已有的 (ax1, ax2) 两个坐标轴上；为 None 时新建图形.
     """
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    if axes is None:
+        import matplotlib.pyplot as plt
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        fig.subplots_adjust(left=0.07, right=0.97, top=0.9, bottom=0.12, wspace=0.25)
+    else:
+        ax1, ax2 = axes
+        fig = ax1.figure
     
     # Fugacity vs pressure
     ax1.plot(pressures, fugacities, 'b-', linewidth=2, label='Fugacity f')
@@ -244,5 +266,4 @@ def plot_fugacity_results(pressures, fugacities, chemical_potentials, fluid_name
     ax2.set_title(f'{fluid_name} Chemical Potential vs Pressure (T={temp_k}K)')
     ax2.grid(True, alpha=0.3)
     
-    plt.tight_layout()
     return fig, (ax1, ax2)
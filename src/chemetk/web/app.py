@@ -1,9 +1,20 @@
+from functools import lru_cache
+
 import dash
 from chemetk.thermo.vle import VLE
+from chemetk.visualization._curves import _vle_curves
 from chemetk.io.vle_datamanager import VLEManager
 from .layout import create_layout
 from .callbacks import register_callbacks
 
+@lru_cache(maxsize=8)
+def _get_vle(data_path: str) -> VLE:
+    """
+    按路径缓存 VLE 实例，重复调用 create_app 时不再重新解析数据和构造插值函数。
+    配合 gunicorn --preload 使用时，各 worker 进程通过 fork 共享同一个已解析的实例。
+    """
+    return VLE(data_path=data_path)
+
 def create_app():
     """创建并配置Dash应用实例"""
     # 加载VLE数据
@@ -11,7 +22,10 @@ def create_app():
     data_path = vle_manager.get_file_path_by_filename("methanol_water_vle")
     if not data_path:
         raise FileNotFoundError("未找到 VLE 数据文件 'methanol_water_vle.json'")
-    vle = VLE(data_path=data_path)
+    vle = _get_vle(data_path)
+    # 平衡曲线与 q、R 无关：启动时预先采样并写入 _vle_curves 的缓存，
+    # 回调 (包括首次加载) 只需重建操作线和塔板阶梯
+    _vle_curves(vle)
 
     # 创建Dash app
     app = dash.Dash(__name__)
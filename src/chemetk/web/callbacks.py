@@ -1,10 +1,27 @@
+from functools import lru_cache
+
+from dash import Patch, ctx
 from dash.dependencies import Input, Output, State
 from chemetk.thermo import vle
 from chemetk.unit_ops.distillation import McCabeThiele
-from chemetk.visualization.plotly_plotting import create_distillation_plot_plotly
+from chemetk.visualization.plotly_plotting import _mccabe_thiele_layout, _mccabe_thiele_traces
 import pandas as pd
 import plotly.graph_objects as go
 
+def _slider_patch(fig, n_static, previous_dynamic):
+    """
+    只移动滑块时返回的局部更新：保留浏览器中已有的平衡线和对角线 (前 n_static 条曲线)，
+    删除上一张图的 previous_dynamic 条动态曲线后追加新的动态曲线，并更新标题，
+    不必重新传输和绘制整张图。
+    """
+    patch = Patch()
+    # 每次删除后其后的曲线前移，因此总是删除同一位置
+    for _ in range(previous_dynamic):
+        del patch['data'][n_static]
+    patch['data'].extend([trace.to_plotly_json() for trace in fig.data[n_static:]])
+    patch['layout']['title'] = fig.layout.title.to_plotly_json()
+    return patch
+
 def register_callbacks(app, vle_obj):
     """注册应用的所有回调函数"""
 
@@ -19,23 +36,14 @@ def register_callbacks(app, vle_obj):
         """当基础参数输入改变时，更新 dcc.Store"""
         return {'F': F, 'xF': xF, 'xD': xD, 'xW': xW}
 
-    @app.callback(
-        Output('mccabe-thiele-graph', 'figure'),
-        [Input('q-slider', 'value'),
-         Input('R-slider', 'value'),
-         Input('problem-definition-store', 'data')]
-    )
-    def update_graph(q_value, r_value, problem_data):
-        """当滑块值或基础参数改变时，更新 McCabe-Thiele 图"""
-        if not problem_data:
-            return go.Figure()
-
-        # 从 dcc.Store 中获取问题定义
-        F = problem_data['F']
-        x_D = problem_data['xD']
-        x_W = problem_data['xW']
-        x_F = problem_data['xF']
-        
+    @lru_cache(maxsize=256)
+    def build_figure(q_value, r_value, F, x_F, x_D, x_W):
+        """
+        按 (q, R, 基础参数) 构造并缓存 McCabe-Thiele 图。计算对给定输入是确定的，
+        拖动滑块来回经过同一取值时直接复用已有的图，不再重复逐级计算和构造曲线。
+
+        :return: (图, 与 q、R 无关的曲线条数)
+        """
         # 计算D和W
         if F is not None and x_F is not None and x_D is not None and x_W is not None and x_D != x_W:
             D = F * (x_F - x_W) / (x_D - x_W)
@@ -58,19 +66,49 @@ def register_callbacks(app, vle_obj):
 
         # 计算理论塔板数
         try:
-            column.calculate_stages()
+            # 图中只需要各级组成，结果缓存在 column 上，绘图时直接复用
+            column.calculate_stage_arrays()
             plot_stages_flag = True
         except Exception:
             # 如果计算失败（例如最小回流比），则不绘制塔板
             plot_stages_flag = False
 
-        # 生成图表
-        fig = create_distillation_plot_plotly(
-            mt_instance=column,
-            plot_stages=plot_stages_flag,
-            title=f"McCabe-Thiele (q={q_value:.1f}, R={r_value:.1f})"
+        # 生成图表：平衡线和对角线在前，随 q、R 变化的曲线在后，记录前者的条数供局部更新使用
+        static, dynamic = _mccabe_thiele_traces(column, plot_stages=plot_stages_flag)
+        fig = go.Figure(
+            data=static + dynamic,
+            layout=_mccabe_thiele_layout(column, title=f"McCabe-Thiele (q={q_value:.1f}, R={r_value:.1f})")
+        )
+        return fig, len(static)
+
+    @app.callback(
+        [Output('mccabe-thiele-graph', 'figure'),
+         Output('graph-traces-store', 'data')],
+        [Input('q-slider', 'value'),
+         Input('R-slider', 'value'),
+         Input('problem-definition-store', 'data')],
+        [State('graph-traces-store', 'data')]
+    )
+    def update_graph(q_value, r_value, problem_data, shown_traces):
+        """
+        当滑块值或基础参数改变时，更新 McCabe-Thiele 图。
+        graph-traces-store 记录当前显示的图中静态/动态曲线的条数，局部更新据此删除旧的动态曲线。
+        """
+        if not problem_data:
+            return go.Figure(), None
+
+        # 从 dcc.Store 中获取问题定义；滑块值取整到 3 位小数作为缓存键，
+        # 避免浮点步进误差 (如 0.30000000000000004) 产生不同的键
+        fig, n_static = build_figure(
+            round(q_value, 3), round(r_value, 3),
+            problem_data['F'], problem_data['xF'], problem_data['xD'], problem_data['xW']
         )
-        return fig
+        traces = {'static': n_static, 'dynamic': len(fig.data) - n_static}
+        # 首次加载或基础参数改变时返回整张图；拖动滑块且浏览器中已有同样结构的图时，只更新随 q、R 变化的部分
+        if (ctx.triggered_id in ('q-slider', 'R-slider')
+                and shown_traces is not None and shown_traces['static'] == n_static):
+            return _slider_patch(fig, n_static, shown_traces['dynamic']), traces
+        return fig, traces
 
     @app.callback(
         Output('q-slider-output', 'children'),
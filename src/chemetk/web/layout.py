@@ -5,6 +5,8 @@ def create_layout():
     return html.Div([
         # 1. 存储组件，用于在回调间传递数据（保留）
         dcc.Store(id='problem-definition-store'),
+        # 当前显示的图中静态/动态曲线的条数，滑块局部更新图表时使用
+        dcc.Store(id='graph-traces-store'),
 
         # 2. 页面标题
         html.Div([
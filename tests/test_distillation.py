@@ -0,0 +1,127 @@
+import contextlib
+import io
+import unittest
+from collections import Counter
+
+import numpy as np
+
+from chemetk.io import paths
+from chemetk.thermo.vle import VLE
+from chemetk.unit_ops.distillation import McCabeThiele, sweep_reflux_ratio
+
+DATA_FILE = paths.get_builtin_data_dir() / 'methanol_water_vle.json'
+
+F, X_F, X_D, X_W, R = 100.0, 0.5, 0.95, 0.05, 2.5
+D = F * (X_F - X_W) / (X_D - X_W)
+W = F - D
+
+# 参考值由逐级计算向量化之前的实现 (interp1d 三次样条 + Python 逐级循环) 计算得到：
+# {(q, 计算方向, Murphree效率): (理论级数, 小数理论级数, 精馏段级数, 提馏段级数)}，q=None 表示全回流
+REFERENCE_STAGES = {
+    (0.0, 'top', 1.0): (7, 5.6106, 4, 3),
+    (0.0, 'top', 0.7): (9, 7.9750, 6, 3),
+    (0.0, 'bottom', 1.0): (6, 4.7161, 4, 2),
+    (0.0, 'bottom', 0.7): (9, 7.3295, 6, 3),
+    (0.5, 'top', 1.0): (7, 5.3976, 4, 3),
+    (0.5, 'top', 0.7): (9, 7.7489, 5, 4),
+    (0.5, 'bottom', 1.0): (6, 4.4033, 4, 2),
+    (0.5, 'bottom', 0.7): (8, 6.8749, 5, 3),
+    (1.0, 'top', 1.0): (7, 5.2949, 4, 3),
+    (1.0, 'top', 0.7): (9, 7.6327, 5, 4),
+    (1.0, 'bottom', 1.0): (6, 4.7069, 3, 3),
+    (1.0, 'bottom', 0.7): (8, 6.6475, 5, 3),
+    (1.3, 'top', 1.0): (7, 5.2246, 3, 4),
+    (1.3, 'top', 0.7): (9, 7.5847, 4, 5),
+    (1.3, 'bottom', 1.0): (6, 4.5952, 3, 3),
+    (1.3, 'bottom', 0.7): (8, 6.5564, 5, 3),
+    (None, 'top', 1.0): (6, 4.2740, 0, 0),
+    (None, 'top', 0.7): (8, 6.2143, 0, 0),
+    (None, 'bottom', 1.0): (5, 3.2003, 0, 0),
+    (None, 'bottom', 0.7): (7, 5.1612, 0, 0),
+}
+
+# 平衡曲线改为查找表 + PCHIP 后，小数理论级数与参考值的偏差约为 1e-3
+DECIMAL_STAGES_TOL = 5e-3
+
+
+def make_column(vle, q):
+    """构造 McCabeThiele 实例 (q=None 时为全回流)，屏蔽初始化时的打印"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        if q is None:
+            return McCabeThiele(vle, X_D, X_W, X_F, 1.0, None, D=0, F=0, W=0)
+        return McCabeThiele(vle, X_D, X_W, X_F, q, R, D=D, F=F, W=W)
+
+
+class StageCountRegressionTest(unittest.TestCase):
+    """甲醇-水体系的逐级计算结果与参考值比较"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vle = VLE(str(DATA_FILE))
+
+    def test_stages_match_reference(self):
+        for (q, start_from, efficiency), expected in REFERENCE_STAGES.items():
+            n_stages, decimal_expected, n_rectifying, n_stripping = expected
+            with self.subTest(q=q, start_from=start_from, efficiency=efficiency):
+                column = make_column(self.vle, q)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stages_df, decimal_stages = column.calculate_stages(
+                        start_from=start_from, murphree_efficiency=efficiency, return_decimal_stages=True)
+
+                self.assertEqual(len(stages_df), n_stages)
+                self.assertAlmostEqual(decimal_stages, decimal_expected, delta=DECIMAL_STAGES_TOL)
+                sections = Counter(stages_df['section'].astype(str))
+                if q is None:
+                    self.assertEqual(sections, Counter({'全回流段': n_stages}))
+                else:
+                    self.assertEqual(sections, Counter({'精馏段': n_rectifying, '提馏段': n_stripping}))
+
+    def test_stage_arrays_match_dataframe(self):
+        for q in (0.0, 0.5, 1.0, 1.3, None):
+            with self.subTest(q=q):
+                column = make_column(self.vle, q)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stages_df = column.calculate_stages()
+                    arrays = column.calculate_stage_arrays()
+                self.assertEqual(arrays['stage'].tolist(), stages_df['stage'].tolist())
+                self.assertEqual(arrays['x_liquid'].tolist(), stages_df['x_liquid'].tolist())
+                self.assertEqual(arrays['y_vapor'].tolist(), stages_df['y_vapor'].tolist())
+
+    def test_reassigned_parameters_are_used(self):
+        column = make_column(self.vle, 1.0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            column.calculate_stage_arrays()
+            column.q = 0.0
+            reassigned = column.calculate_stages(return_decimal_stages=True)[1]
+        self.assertAlmostEqual(reassigned, REFERENCE_STAGES[(0.0, 'top', 1.0)][1], delta=DECIMAL_STAGES_TOL)
+
+
+class SweepRefluxRatioTest(unittest.TestCase):
+    """回流比扫描与逐个回流比构造 McCabeThiele 的结果一致"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vle = VLE(str(DATA_FILE))
+
+    def test_sweep_matches_per_ratio_loop(self):
+        R_values = np.linspace(0.8, 4.0, 17)
+        # q 接近 1 和 0 时两者须选择同一条 q 线分支
+        for q in (0.0, 1e-12, 0.5, 1.0, 1.0 + 1e-9, 1.3):
+            for efficiency in (1.0, 0.7):
+                with self.subTest(q=q, efficiency=efficiency):
+                    swept = sweep_reflux_ratio(self.vle, X_D, X_W, X_F, q, R_values,
+                                               D=D, F=F, W=W, murphree_efficiency=efficiency)
+                    expected = []
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        for r in R_values:
+                            column = McCabeThiele(self.vle, X_D, X_W, X_F, q, r, D=D, F=F, W=W)
+                            expected.append(len(column.calculate_stages(murphree_efficiency=efficiency)))
+                    self.assertEqual(swept.tolist(), expected)
+
+    def test_total_reflux_is_rejected(self):
+        with self.assertRaises(ValueError):
+            sweep_reflux_ratio(self.vle, X_D, X_W, X_F, 1.0, [1.0, 2.0], D=0, F=0, W=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import contextlib
+import io
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from chemetk.io import _json, nist_datamanager
+
+
+def use_temp_cache_dir(testcase):
+    """把 NIST 缓存目录和索引重定向到临时目录，测试结束后自动清理"""
+    tmp = tempfile.TemporaryDirectory()
+    testcase.addCleanup(tmp.cleanup)
+    cache_dir = Path(tmp.name)
+    for name, value in (('CACHE_DIR', cache_dir),
+                        ('INDEX_FILE', cache_dir / 'nist_data_index.json'),
+                        ('_INDEX_CACHE', {'mtime_ns': None, 'data': {}})):
+        patcher = mock.patch.object(nist_datamanager, name, value)
+        patcher.start()
+        testcase.addCleanup(patcher.stop)
+
+
+def fake_isotherm_response(url, params=None, timeout=None):
+    """模拟 NIST 的等温线响应：数据随请求温度变化，温度越低返回越晚，打乱完成顺序"""
+    temp = float(params['T'])
+    time.sleep((320.0 - temp) / 1000)
+    content = (
+        '# comment line\n'
+        'Temperature (K)\tPressure (MPa)\tPhase\n'
+        f'{temp}\t0.1\tvapor\n'
+        f'{temp}\t0.2\tvapor\n'
+    ).encode('utf-8')
+    response = mock.MagicMock(status_code=200, content=content)
+    response.__enter__.return_value = response
+    return response
+
+
+class CacheNumpyParamsTest(unittest.TestCase):
+    """以 numpy 标量作为请求参数时，缓存的写入和读取 (如遍历 np.linspace 得到的温度)"""
+
+    def setUp(self):
+        use_temp_cache_dir(self)
+
+    def test_cache_request_with_float64_params(self):
+        df = pd.DataFrame({'Pressure (MPa)': [0.1, 0.2], 'Volume (m3/mol)': [0.02, 0.01]})
+        params = nist_datamanager._make_request_params(
+            'C124389', np.float64(300.0), np.float64(0.1), np.float64(0.2), np.float64(0.1), 'K', 'MPa')
+
+        nist_datamanager.cache_data(df, params)
+
+        # 与 Python float 参数得到同一个哈希，并能从缓存读回
+        plain = nist_datamanager._make_request_params('C124389', 300.0, 0.1, 0.2, 0.1, 'K', 'MPa')
+        self.assertEqual(nist_datamanager._get_request_hash(params),
+                         nist_datamanager._get_request_hash(plain))
+        cached = nist_datamanager.get_cached_data(plain)
+        pd.testing.assert_frame_equal(cached, df)
+
+    def test_dumps_numpy_values(self):
+        data = {'temp': np.float64(300.0), 'n': np.int64(3), 'values': np.array([1.0, 2.0])}
+        self.assertEqual(_json.loads(_json.dumps(data)), {'temp': 300.0, 'n': 3, 'values': [1.0, 2.0]})
+
+
+class FetchIsothermBatchTest(unittest.TestCase):
+    """批量获取等温线：结果按输入温度的顺序返回，命中缓存的温度不再请求网络"""
+
+    def setUp(self):
+        use_temp_cache_dir(self)
+        patcher = mock.patch.object(nist_datamanager._SESSION, 'get', side_effect=fake_isotherm_response)
+        self.get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch(self, temps):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return nist_datamanager.fetch_isotherm_data_batch('C124389', temps, 0.1, 0.2)
+
+    def test_results_keep_input_order(self):
+        temps = [310.0, 300.0, np.float64(305.0)]
+        results = self.fetch(temps)
+
+        self.assertEqual(list(results), temps)
+        for temp, df in results.items():
+            self.assertEqual(list(df.columns), ['Temperature (K)', 'Pressure (MPa)', 'Phase'])
+            self.assertEqual(df['Temperature (K)'].tolist(), [temp, temp])
+        self.assertEqual(self.get.call_count, 3)
+
+    def test_cache_hits_skip_network(self):
+        first = self.fetch([310.0, 300.0])
+        self.get.reset_mock()
+
+        # 已缓存的温度直接读取缓存，只有新温度发起请求
+        results = self.fetch([300.0, 315.0, 310.0])
+        self.assertEqual(list(results), [300.0, 315.0, 310.0])
+        self.assertEqual([float(call.kwargs['params']['T']) for call in self.get.call_args_list], [315.0])
+        pd.testing.assert_frame_equal(results[300.0], first[300.0])
+        pd.testing.assert_frame_equal(results[310.0], first[310.0])
+
+        self.get.reset_mock()
+        self.fetch([310.0, 315.0, 300.0])
+        self.get.assert_not_called()
+
+    def test_failed_request_maps_to_none(self):
+        def fail_at_305(url, params=None, timeout=None):
+            if float(params['T']) == 305.0:
+                response = mock.MagicMock(status_code=500)
+                response.__enter__.return_value = response
+                return response
+            return fake_isotherm_response(url, params, timeout)
+
+        self.get.side_effect = fail_at_305
+        results = self.fetch([300.0, 305.0])
+        self.assertIsNone(results[305.0])
+        self.assertEqual(results[300.0]['Temperature (K)'].tolist(), [300.0, 300.0])
+        # 失败的结果不写入缓存，下次仍会请求
+        self.get.reset_mock()
+        self.get.side_effect = fake_isotherm_response
+        self.fetch([300.0, 305.0])
+        self.assertEqual([float(call.kwargs['params']['T']) for call in self.get.call_args_list], [305.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import json
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from scipy.interpolate import CubicSpline, PchipInterpolator
+
+from chemetk.io import paths
+from chemetk.thermo.vle import VLE, _cubic_splines
+
+DATA_FILE = paths.get_builtin_data_dir() / 'methanol_water_vle.json'
+
+# 以液相组成、气相组成和温度为自变量的单值查询方法
+X_GETTERS = ('get_temperature_by_x', 'get_y_by_x', 'get_alpha_by_x')
+Y_GETTERS = ('get_temperature_by_y', 'get_x_by_y')
+TEMP_GETTERS = ('get_x_by_temp', 'get_y_by_temp', 'get_alpha_by_temp')
+
+
+class VLEEvaluatorTest(unittest.TestCase):
+    """插值求值器对标量、0 维数组和多维数组输入的一致性"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vle = VLE(str(DATA_FILE))
+        cls.queries = {
+            X_GETTERS: np.array([[0.0, 0.013, 0.3], [0.55, 0.9999, 1.0]]),
+            Y_GETTERS: np.array([[0.2, 0.45, 0.6], [0.8, 0.95, 0.99]]),
+            TEMP_GETTERS: np.array([[65.0, 70.0, 75.5], [80.0, 90.0, 99.0]]),
+        }
+
+    def test_scalar_0d_and_array_round_trip(self):
+        for getters, queries in self.queries.items():
+            for name in getters:
+                getter = getattr(self.vle, name)
+                expected = [getter(float(q)) for q in queries.ravel()]
+                with self.subTest(getter=name):
+                    for value in expected:
+                        self.assertIsInstance(value, float)
+                    result = getter(queries)
+                    self.assertEqual(result.shape, queries.shape)
+                    np.testing.assert_allclose(result.ravel(), expected, rtol=1e-12, atol=1e-12)
+                    zero_d = getter(np.array(queries.flat[2]))
+                    self.assertEqual(np.ndim(zero_d), 0)
+                    self.assertAlmostEqual(float(zero_d), expected[2], places=12)
+                    # 列表输入与数组输入相同
+                    np.testing.assert_allclose(getter(queries.ravel().tolist()), expected, rtol=1e-12, atol=1e-12)
+
+    def test_out_of_range_and_nan_give_nan(self):
+        for getters, queries in self.queries.items():
+            outside = float(queries.max()) + 10.0
+            for name in getters:
+                getter = getattr(self.vle, name)
+                with self.subTest(getter=name):
+                    self.assertTrue(math.isnan(getter(outside)))
+                    self.assertTrue(math.isnan(getter(float('nan'))))
+                    result = getter(np.array([queries.flat[2], outside, np.nan]))
+                    self.assertFalse(np.isnan(result[0]))
+                    self.assertTrue(np.isnan(result[1:]).all())
+
+    def test_interpolation_passes_through_data(self):
+        np.testing.assert_allclose(self.vle.get_y_by_x(self.vle.x_values), self.vle.y_values, atol=1e-12)
+        np.testing.assert_allclose(self.vle.get_temperature_by_x(self.vle.x_values), self.vle.temps, atol=1e-9)
+        np.testing.assert_allclose(self.vle.get_x_by_y(self.vle.y_values), self.vle.x_values, atol=1e-12)
+
+    def test_compiled_path_matches_ppoly(self):
+        q = np.linspace(-0.1, 1.1, 301)
+        for spline in (self.vle.y_from_x, self.vle.temp_from_x, self.vle.alpha_from_x):
+            np.testing.assert_allclose(spline(q), spline.ppoly(q), rtol=1e-12, atol=1e-12, equal_nan=True)
+
+    def test_all_properties_match_single_getters(self):
+        for x in (0.3, np.array(0.3), np.array([0.05, 0.3, 0.7, 1.5])):
+            with self.subTest(x=x):
+                props = self.vle.get_all_properties_by_x(x)
+                np.testing.assert_allclose(props['temperature'], self.vle.get_temperature_by_x(x), rtol=1e-12)
+                np.testing.assert_allclose(props['vapor_composition'], self.vle.get_y_by_x(x), rtol=1e-12)
+                np.testing.assert_allclose(props['relative_volatility'], self.vle.get_alpha_by_x(x), rtol=1e-12)
+                self.assertEqual(np.ndim(props['temperature']), np.ndim(x))
+        for temp in (80.0, np.array(80.0), np.array([66.0, 80.0, 95.0, 150.0])):
+            with self.subTest(temp=temp):
+                props = self.vle.get_all_properties_by_temp(temp)
+                np.testing.assert_allclose(props['liquid_composition'], self.vle.get_x_by_temp(temp), rtol=1e-12)
+                np.testing.assert_allclose(props['vapor_composition'], self.vle.get_y_by_temp(temp), rtol=1e-12)
+                np.testing.assert_allclose(props['relative_volatility'], self.vle.get_alpha_by_temp(temp), rtol=1e-12)
+
+    def test_fast_paths_are_linear_between_points(self):
+        x = self.vle.x_values
+        order = np.argsort(x)
+        x_mid = 0.5 * (x[order][:-1] + x[order][1:])
+        expected = np.interp(x_mid, x[order], self.vle.y_values[order])
+        np.testing.assert_allclose(self.vle.get_y_by_x(x_mid, fast=True), expected)
+        self.assertTrue(math.isnan(self.vle.get_x_by_y(2.0, fast=True)))
+
+
+class SplineSelectionTest(unittest.TestCase):
+    """严格单调的数据使用 PCHIP，其余使用三次样条"""
+
+    def test_monotone_uses_pchip(self):
+        a = np.array([0.3, 0.0, 0.6, 1.0])
+        increasing, decreasing, bumpy = _cubic_splines(
+            a, a ** 2, 1.0 - a, np.array([1.0, 0.0, 2.0, 1.5]))
+        self.assertIsInstance(increasing.ppoly, PchipInterpolator)
+        self.assertIsInstance(decreasing.ppoly, PchipInterpolator)
+        self.assertIsInstance(bumpy.ppoly, CubicSpline)
+        # 断点按自变量排序
+        np.testing.assert_array_equal(increasing.x, np.sort(a))
+
+    def test_missing_alpha_gives_float_nan(self):
+        data = json.loads(DATA_FILE.read_text(encoding='utf-8'))
+        for point in data['data']:
+            point.pop('alpha', None)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'no_alpha.json'
+            path.write_text(json.dumps(data), encoding='utf-8')
+            vle = VLE(str(path))
+        self.assertFalse(vle.has_alpha)
+        self.assertIsInstance(vle.get_alpha_by_x(0.3), float)
+        self.assertTrue(math.isnan(vle.get_all_properties_by_x(0.3)['relative_volatility']))
+        self.assertTrue(math.isnan(vle.get_all_properties_by_temp(80.0)['relative_volatility']))
+        self.assertTrue(np.isnan(vle.get_alpha_by_x(np.array([0.1, 0.5]))).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from chemetk.io import paths
+from chemetk.io.vle_datamanager import VLEManager
+
+
+def write_system(path, name, components, temps):
+    data = {
+        'name': name,
+        'components': components,
+        'data': [{'temp': t, 'x': i / 10, 'y': i / 10, 'alpha': 2.0} for i, t in enumerate(temps)],
+    }
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+
+def bump_mtime(path):
+    """把修改时间往后推一秒，避免文件系统时间精度导致 mtime 看起来没有变化"""
+    mtime_ns = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class VLEManagerTest(unittest.TestCase):
+    """用户数据目录中文件的发现、按 mtime 复用解析结果、reload 和查找索引"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(paths, 'get_user_data_dir', return_value=Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.vle_dir = Path(tmp.name) / 'vle'
+        self.vle_dir.mkdir()
+        write_system(self.vle_dir / 'a_b.json', 'A-B', ['A', 'B'], [80.0, 70.0, 60.0])
+        write_system(self.vle_dir / 'c_d.json', 'C-D', ['C', 'D'], [50.0, 40.0])
+        self.parse = mock.patch.object(VLEManager, '_parse_file', autospec=True,
+                                       side_effect=VLEManager._parse_file)
+        self.parse_mock = self.parse.start()
+        self.addCleanup(self.parse.stop)
+
+    def make_manager(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return VLEManager()
+
+    def parsed_filenames(self):
+        return sorted(call.args[2] for call in self.parse_mock.call_args_list)
+
+    def test_indexes(self):
+        manager = self.make_manager()
+        self.assertEqual(manager.get_file_by_name('A-B')['filename'], 'a_b.json')
+        self.assertIsNone(manager.get_file_by_name('missing'))
+        # 组分查找与顺序无关
+        self.assertEqual([info['name'] for info in manager.get_files_by_components(['B', 'A'])], ['A-B'])
+        self.assertEqual(manager.get_files_by_components(['A', 'C']), [])
+        self.assertIn('methanol_water_vle', manager.list_available_systems())
+
+    def test_reload_reparses_only_touched_files(self):
+        manager = self.make_manager()
+        self.parse_mock.reset_mock()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.reload()
+        self.assertEqual(self.parsed_filenames(), [])
+
+        path = self.vle_dir / 'a_b.json'
+        write_system(path, 'A-B renamed', ['A', 'E'], [90.0, 70.0, 65.0, 60.0])
+        bump_mtime(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.reload()
+        self.assertEqual(self.parsed_filenames(), ['a_b.json'])
+
+        info = manager.get_system_info_by_filename('a_b')
+        self.assertEqual(info['data_points'], 4)
+        self.assertEqual(info['temperature_range'], (60.0, 90.0))
+        # 索引随重新解析的结果更新
+        self.assertIsNone(manager.get_file_by_name('A-B'))
+        self.assertEqual(manager.get_file_by_name('A-B renamed')['filename'], 'a_b.json')
+        self.assertEqual(manager.get_files_by_components(['A', 'B']), [])
+        self.assertEqual(len(manager.get_files_by_components(['E', 'A'])), 1)
+
+    def test_system_info_reparses_modified_file(self):
+        manager = self.make_manager()
+        self.assertEqual(manager.get_system_info_by_filename('c_d')['data_points'], 2)
+        self.parse_mock.reset_mock()
+
+        path = self.vle_dir / 'c_d.json'
+        write_system(path, 'C-D', ['C', 'D'], [55.0, 45.0, 35.0])
+        bump_mtime(path)
+        info = manager.get_system_info_by_filename('c_d')
+        self.assertEqual(info['data_points'], 3)
+        self.assertEqual(info['temperature_range'], (35.0, 55.0))
+        self.assertEqual(self.parsed_filenames(), ['c_d.json'])
+
+        # 未再修改时直接使用已解析的结果
+        self.parse_mock.reset_mock()
+        manager.get_system_info_by_filename('c_d')
+        self.assertEqual(self.parsed_filenames(), [])
+
+    def test_new_file_is_found_on_reload(self):
+        manager = self.make_manager()
+        write_system(self.vle_dir / 'e_f.json', 'E-F', ['E', 'F'], [30.0, 20.0])
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.reload()
+        self.assertEqual(manager.get_file_by_name('E-F')['filename'], 'e_f.json')
+
+
+if __name__ == '__main__':
+    unittest.main()
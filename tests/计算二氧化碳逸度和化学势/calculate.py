@@ -30,11 +30,12 @@ def main():
 
     # --- 2. 数据预处理 ---
     # 将体积从 m³/mol 转换为需要的值，并处理 'infinite'
-    df['Volume (m3/mol)'] = pd.to_numeric(df['Volume (m3/mol)'], errors='coerce')
-    df = df.dropna(subset=['Volume (m3/mol)']) # 移除无法转换的行
+    # 无法转换的行变为 NaN，用同一个掩码过滤压力和体积，不再复制整个 DataFrame
+    volumes = pd.to_numeric(df['Volume (m3/mol)'], errors='coerce').to_numpy(dtype=np.float64)
+    valid = ~np.isnan(volumes) # 移除无法转换的行
 
-    pressures_mpa = df['Pressure (MPa)'].values.astype(np.float64)
-    volumes_m3_mol = df['Volume (m3/mol)'].values.astype(np.float64)
+    pressures_mpa = df['Pressure (MPa)'].to_numpy(dtype=np.float64)[valid]
+    volumes_m3_mol = volumes[valid]
     
     # 转换为计算函数所需的单位 (Pa)
     pressures_pa = pressures_mpa * 1e6
@@ -74,8 +75,12 @@ def main():
     print("-" * 60)
     
     target_pressures = [2.0, 5.0]
-    for target_p in target_pressures:
-        idx = np.argmin(np.abs(pressures_mpa - target_p))
+    # 等温线按压力递增扫描，用二分查找定位最近的数据点：
+    # searchsorted 给出右侧相邻点，再与左侧相邻点比较取较近者
+    right = np.searchsorted(pressures_mpa, target_pressures).clip(1, len(pressures_mpa) - 1)
+    left = right - 1
+    nearest = np.where(target_pressures - pressures_mpa[left] <= pressures_mpa[right] - target_pressures, left, right)
+    for target_p, idx in zip(target_pressures, nearest):
         
         print(f"目标压力: {target_p} MPa (实际数据点: {pressures_mpa[idx]:.3f} MPa)")
         print(f"  逸度 f: {fugacities_mpa[idx]:.4f} MPa")